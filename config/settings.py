@@ -7,6 +7,7 @@ from pathlib import Path
 from pydantic import BaseModel, Field, validator
 from pydantic_settings import BaseSettings
 import json
+from functools import lru_cache
 from dotenv import load_dotenv
 
 class LLMSettings(BaseModel):
@@ -60,6 +61,9 @@ class ProcessingSettings(BaseModel):
     min_recipe_quality_score: float = 0.6
     require_ingredients: bool = True
     require_instructions: bool = True
+    
+    # Batch processing (URLs fetched and processed concurrently)
+    batch_concurrency: int = 8
 
 class OutputSettings(BaseModel):
     """Output configuration."""
@@ -147,28 +151,25 @@ class Settings(BaseSettings):
         # Load environment variables
         load_dotenv()
         
-        # Load from config file if provided
-        if config_file and config_file.exists():
-            with open(config_file, 'r') as f:
-                config_data = json.load(f)
-            return cls(**config_data)
-        
-        # Load from default locations
+        # Config file if provided, else the first JSON file in the default locations
         default_config_paths = [
             Path(".env"),
             Path("config/settings.json"),
             Path("settings.json")
         ]
+        if config_file and config_file.exists():
+            config_path = config_file
+        else:
+            config_path = next((path for path in default_config_paths if path.suffix == '.json' and path.exists()), None)
         
-        for config_path in default_config_paths:
-            if config_path.exists():
-                if config_path.suffix == '.json':
-                    with open(config_path, 'r') as f:
-                        config_data = json.load(f)
-                    return cls(**config_data)
-        
-        # Return with environment variables and defaults
-        return cls()
+        # Validated settings are reused until the file, working directory (pydantic reads
+        # ./.env) or environment changes; callers get their own copy since they modify it
+        if config_path is not None:
+            key = (str(config_path.resolve()), config_path.stat().st_mtime_ns)
+        else:
+            key = (None, None)
+        settings = _load_settings(cls, *key, os.getcwd(), frozenset(os.environ.items()))
+        return settings.model_copy(deep=True)
     
     def save(self, config_file: Path):
         """Save settings to file."""
@@ -221,4 +222,14 @@ class Settings(BaseSettings):
     
     def to_json(self) -> str:
         """Convert to JSON string."""
-        return self.json(indent=2, default=str)
\ No newline at end of file
+        return self.json(indent=2, default=str)
+
+
+@lru_cache(maxsize=8)
+def _load_settings(cls, config_path: Optional[str], mtime_ns: Optional[int], cwd: str, environ: frozenset) -> Settings:
+    """Build settings from a JSON config file (or defaults and environment when None)."""
+    if config_path is None:
+        return cls()
+    with open(config_path, 'r') as f:
+        config_data = json.load(f)
+    return cls(**config_data)
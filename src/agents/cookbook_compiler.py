@@ -6,13 +6,19 @@ properly formatted LaTeX cookbook, with validation and automatic formatting.
 """
 
 import json
+import mmap
+import os
+from bisect import bisect_left
 import re
 import shutil
 import subprocess
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from jinja2 import Environment, FileSystemLoader
+from functools import lru_cache
+from itertools import repeat
+from jinja2 import Environment, FileSystemLoader, Template
 
 import sys
 from pathlib import Path
@@ -21,8 +27,111 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.models.recipe import Recipe
+from src.utils.latex_build import needs_rerun, read_auxiliary_state
 from config.settings import OutputSettings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Recipe JSON at least this large is parsed by orjson straight from a read-only memory map
+_MMAP_MIN_BYTES = 64 * 1024
+
+# Characters dropped from safe filenames: anything but letters, digits, '_' and '-'
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w-]')
+
+
+@lru_cache(maxsize=1024)
+def _safe_filename(title: str) -> str:
+    """Convert recipe title to safe filename (titles repeat across tex, main.tex and image passes)."""
+    safe = title.lower().replace(' ', '-').replace('&', 'and')
+    return _UNSAFE_FILENAME_CHARS.sub('', safe)[:50]  # Limit length
+
+
+# Skeletons of the generated main.tex and titlepage.tex (str.format fields, literal braces doubled)
+_MAIN_TEX_TEMPLATE = """\\documentclass{{recipebook}}
+
+\\settitle{{{title}}}
+\\setauthor{{{author}}}
+
+\\begin{{document}}
+\\input{{titlepage}}
+\\customtableofcontents
+
+{recipe_inputs}
+
+\\end{{document}}
+"""
+
+_TITLEPAGE_TEMPLATE = """\\begin{{titlepage}}
+\\centering
+\\vspace*{{2cm}}
+
+{{\\Huge\\textbf{{{title}}}}}
+
+\\vspace{{1cm}}
+
+{{\\Large by {author}}}
+
+\\vspace{{2cm}}
+
+{{\\large {description}}}
+
+\\vfill
+
+{{\\small Compiled on \\today}}
+
+\\end{{titlepage}}
+"""
+
+# Common cooking fractions, sorted by value
+_COMMON_FRACTIONS = (
+    (0.125, "1/8"), (0.25, "1/4"), (0.33, "1/3"), (0.375, "3/8"), (0.5, "1/2"),
+    (0.625, "5/8"), (0.67, "2/3"), (0.75, "3/4"), (0.875, "7/8")
+)
+_COMMON_FRACTION_DECIMALS = tuple(value for value, _ in _COMMON_FRACTIONS)
+
+
+@lru_cache(maxsize=512)
+def _format_fraction(decimal: float) -> str:
+    """Convert decimal to readable fraction (cookbooks reuse a handful of quantities)."""
+    # Find closest fraction: only the neighbours around the insertion point can be closest
+    index = bisect_left(_COMMON_FRACTION_DECIMALS, decimal)
+    neighbours = _COMMON_FRACTIONS[max(0, index - 1):index + 1]
+    closest, text = min(neighbours, key=lambda item: abs(item[0] - decimal))
+    if abs(closest - decimal) < 0.05:  # Close enough
+        return text
+    
+    # Return decimal with reasonable precision
+    return f"{decimal:.2f}".rstrip('0').rstrip('.')
+
+
+def _json_image_filename(image_url: Optional[str]) -> Optional[str]:
+    """File name of an image the recipe JSON references as ./image/<name>, else None."""
+    if image_url and image_url.startswith("./image/"):
+        return image_url.replace("./image/", "")
+    return None
+
+
+# Fewest recipes worth starting worker processes for (--jobs)
+_MIN_PROCESS_POOL_RECIPES = 4
+
+# Agent a recipe-generation worker uses (set by _init_recipe_worker)
+_worker_agent = None
+
+
+def _init_recipe_worker(settings: OutputSettings, template_dirs: List[str]) -> None:
+    """Build the agent a recipe-generation worker reuses, with the parent's settings and template directories."""
+    global _worker_agent
+    _worker_agent = CookbookCompilerAgent(settings)
+    _worker_agent.jinja_env.loader = FileSystemLoader(template_dirs)
+
+
+def _generate_recipe_in_worker(recipe: Recipe, images_dir: Path, recipes_dir: Path) -> None:
+    """Create one recipe's image and .tex file in a worker process."""
+    _worker_agent._generate_recipe_file(recipe, images_dir, recipes_dir)
+
 
 @dataclass
 class CookbookMetadata:
@@ -58,8 +167,11 @@ class CookbookCompilerAgent:
             block_start_string='{%',
             block_end_string='%}',
             comment_start_string='{#',
-            comment_end_string='#}'
+            comment_end_string='#}',
+            auto_reload=False
         )
+        # Compiled recipe template, loaded on first use and shared by every recipe
+        self._recipe_template: Optional[Template] = None
         
         # Page estimation constants (rough estimates)
         self.chars_per_page = 2000  # Approximate characters per page
@@ -84,7 +196,8 @@ class CookbookCompilerAgent:
         output_dir: Path,
         metadata: CookbookMetadata = None,
         max_pages_per_recipe: int = 1,
-        auto_build: bool = True
+        auto_build: bool = True,
+        jobs: Optional[int] = None
     ) -> bool:
         """
         Compile a complete cookbook from JSON recipes and images.
@@ -96,6 +209,7 @@ class CookbookCompilerAgent:
             metadata: Cookbook metadata
             max_pages_per_recipe: Maximum pages allowed per recipe
             auto_build: Whether to automatically build PDF
+            jobs: Worker processes for per-recipe image and LaTeX generation (None or 1: threads in-process)
             
         Returns:
             True if successful, False otherwise
@@ -132,11 +246,9 @@ class CookbookCompilerAgent:
             # Copy and organize images
             self._organize_images(image_dir, output_dir / "images")
             
-            # Create placeholder images for recipes that don't have images
-            self._create_missing_recipe_images(validated_recipes, output_dir / "images")
-            
-            # Generate individual recipe LaTeX files
-            self._generate_recipe_tex_files(validated_recipes, output_dir)
+            # Create placeholder images for recipes that don't have images and generate
+            # individual recipe LaTeX files, in one pass over the recipes
+            self._generate_recipe_files(validated_recipes, output_dir, jobs)
             
             # Generate main cookbook file
             self._generate_main_cookbook(validated_recipes, output_dir, metadata)
@@ -155,6 +267,12 @@ class CookbookCompilerAgent:
             self.logger.error(f"Cookbook compilation failed: {e}")
             return False
     
+    def _get_recipe_template(self) -> Template:
+        """Get the compiled cookbook recipe template, compiling it only once per agent."""
+        if self._recipe_template is None:
+            self._recipe_template = self.jinja_env.get_template("cookbook_recipe.tex")
+        return self._recipe_template
+    
     def _setup_cookbook_structure(self, output_dir: Path):
         """Create the necessary directory structure for the cookbook."""
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -164,12 +282,21 @@ class CookbookCompilerAgent:
     
     def _load_recipes(self, json_dir: Path) -> List[Recipe]:
         """Load all JSON recipes from directory."""
+        try:
+            with os.scandir(json_dir) as entries:
+                json_files = [entry.path for entry in entries if entry.name.endswith(".json") and entry.is_file()]
+        except FileNotFoundError:
+            json_files = []
+        
+        return self._load_recipe_files(json_files)
+    
+    def _load_recipe_files(self, json_files: List[Union[str, Path]]) -> List[Recipe]:
+        """Load the given JSON recipe files, sorted by title."""
         recipes = []
         
-        for json_file in json_dir.glob("*.json"):
+        for json_file in json_files:
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    recipe_data = json.load(f)
+                recipe_data = self._read_json_file(json_file)
                 
                 # Convert to Recipe object
                 recipe = Recipe(**recipe_data)
@@ -182,6 +309,16 @@ class CookbookCompilerAgent:
         recipes.sort(key=lambda r: r.title.lower())
         return recipes
     
+    def _read_json_file(self, json_file: str) -> Any:
+        """Decode a JSON file straight from bytes, with orjson when it is installed."""
+        with open(json_file, 'rb') as f:
+            if orjson is not None and os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+                # Large files: parse from the page cache without copying into a bytes object first
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    return orjson.loads(view)
+            raw = f.read()
+        return orjson.loads(raw) if orjson else json.loads(raw)
+    
     def _sort_ingredients_by_type(self, ingredients: List[Any]) -> List[Any]:
         """Sort ingredients by type (meat, dairy, dry ingredients, etc.) without category labels."""
         
@@ -704,37 +841,26 @@ class CookbookCompilerAgent:
         """Copy and organize recipe images with better handling of missing images."""
         target_image_dir.mkdir(parents=True, exist_ok=True)
         
-        if not source_image_dir.exists():
+        source_files = self._scan_source_images(source_image_dir)
+        if source_files is None:
             self.logger.warning(f"Source image directory not found: {source_image_dir}")
             # Create a default placeholder image
             self._create_default_placeholder(target_image_dir)
             return
         
-        # Track copied images for validation
-        copied_images = set()
-        
         # Copy all valid images
-        for image_file in source_image_dir.iterdir():
-            if image_file.is_file() and image_file.suffix.lower() in ['.jpg', '.jpeg', '.png', '.gif']:
-                try:
-                    target_path = target_image_dir / image_file.name
-                    
-                    # Verify the image is valid before copying
-                    if self._validate_image_file(image_file):
-                        shutil.copy2(image_file, target_path)
-                        copied_images.add(image_file.name)
-                        self.logger.debug(f"Copied valid image: {image_file.name}")
-                    else:
-                        self.logger.warning(f"Invalid image file skipped: {image_file.name}")
-                        
-                except Exception as e:
-                    self.logger.warning(f"Failed to copy image {image_file.name}: {e}")
-            
-            elif image_file.suffix.lower() == '.txt':
-                # Handle text placeholder files by creating proper image placeholders
-                self.logger.info(f"Converting text placeholder to image: {image_file.name}")
-                recipe_name = image_file.stem
-                self._create_recipe_placeholder_image(target_image_dir, recipe_name)
+        image_files, text_placeholders = source_files
+        for image_file in text_placeholders:
+            # Handle text placeholder files by creating proper image placeholders
+            self.logger.info(f"Converting text placeholder to image: {image_file.name}")
+            recipe_name = image_file.stem
+            self._create_recipe_placeholder_image(target_image_dir, recipe_name)
+        
+        # Validation and copying is per-file I/O, so overlap it across threads
+        with ThreadPoolExecutor(max_workers=max(1, min(32, len(image_files)))) as executor:
+            copied = executor.map(lambda image_file: self._copy_image_file(image_file, target_image_dir), image_files)
+            # Track copied images for validation
+            copied_images = {image_file.name for image_file, ok in zip(image_files, copied) if ok}
         
         # Create default placeholder if no images were copied
         if not copied_images:
@@ -742,47 +868,132 @@ class CookbookCompilerAgent:
             
         self.logger.info(f"Organized {len(copied_images)} images in cookbook")
     
+    def _scan_source_images(self, source_image_dir: Path) -> Optional[Tuple[List[Path], List[Path]]]:
+        """List (image files, .txt placeholders) in a source directory in one pass, or None if it is missing."""
+        image_files = []
+        text_placeholders = []
+        try:
+            # DirEntry caches the file type from the directory read, so no per-file stat
+            with os.scandir(source_image_dir) as entries:
+                for entry in entries:
+                    suffix = os.path.splitext(entry.name)[1].lower()
+                    if suffix in ('.jpg', '.jpeg', '.png', '.gif') and entry.is_file():
+                        image_files.append(Path(entry.path))
+                    elif suffix == '.txt':
+                        text_placeholders.append(Path(entry.path))
+        except FileNotFoundError:
+            return None
+        return image_files, text_placeholders
+    
+    def _copy_image_file(self, image_file: Path, target_image_dir: Path) -> bool:
+        """Copy one recipe image into the cookbook if it is a valid image; returns whether it was copied."""
+        try:
+            target_path = target_image_dir / image_file.name
+            
+            # Verify the image is valid before copying
+            if self._validate_image_file(image_file):
+                self._link_or_copy_file(image_file, target_path)
+                self.logger.debug(f"Copied valid image: {image_file.name}")
+                return True
+            
+            self.logger.warning(f"Invalid image file skipped: {image_file.name}")
+            
+        except Exception as e:
+            self.logger.warning(f"Failed to copy image {image_file.name}: {e}")
+        return False
+    
+    def _link_or_copy_file(self, source: Path, target: Path):
+        """Hard-link source to target (no bytes moved), falling back to a plain content copy."""
+        try:
+            if os.path.samefile(source, target):
+                return  # Already linked by an earlier build
+            # Replace rather than write through: the old target may be a hard link to another file
+            os.unlink(target)
+        except FileNotFoundError:
+            pass
+        
+        try:
+            os.link(source, target)
+            return
+        except OSError:
+            # Different filesystem, or no hard link support
+            pass
+        
+        # copyfile uses the kernel's zero-copy path where available and skips copy2's metadata calls
+        shutil.copyfile(source, target)
+    
+    def _save_jpeg_replacing(self, img: Any, image_path: Path):
+        """Save a JPEG to a temp file and rename it into place, so a hard-linked source image is never written through."""
+        temp_path = image_path.with_name(f".{image_path.name}.tmp")
+        img.save(temp_path, 'JPEG', quality=85)
+        os.replace(temp_path, image_path)
+    
     def _generate_recipe_tex_files(self, validated_recipes: List[Tuple[Recipe, RecipeValidationResult]], output_dir: Path):
         """Generate individual LaTeX files for each recipe."""
         recipes_dir = output_dir / "recipes"
         
-        # Load the cookbook recipe template
-        template = self.jinja_env.get_template("cookbook_recipe.tex")
+        # Load the cookbook recipe template before the workers start; they only render it
+        template = self._get_recipe_template()
         
-        for recipe, validation in validated_recipes:
-            try:
-                # Format recipe data for LaTeX
-                formatted_data = self._format_recipe_for_latex(recipe)
-                
-                # Render the template
-                tex_content = template.render(**formatted_data)
-                
-                # Generate safe filename
-                safe_title = self._make_safe_filename(recipe.title)
-                tex_file = recipes_dir / f"{safe_title}.tex"
-                
-                # Write the file
-                with open(tex_file, 'w', encoding='utf-8') as f:
-                    f.write(tex_content)
-                
-                self.logger.debug(f"Generated LaTeX file: {tex_file.name}")
-                
-            except Exception as e:
-                self.logger.error(f"Failed to generate LaTeX for recipe '{recipe.title}': {e}")
+        # Overlap per-recipe formatting and file writes across threads
+        with ThreadPoolExecutor(max_workers=max(1, min(32, len(validated_recipes)))) as executor:
+            list(executor.map(lambda item: self._write_recipe_tex_file(item[0], template, recipes_dir), validated_recipes))
+    
+    def _generate_recipe_files(self, validated_recipes: List[Tuple[Recipe, RecipeValidationResult]], output_dir: Path,
+                               jobs: Optional[int] = None):
+        """Ensure each recipe has an image and write its LaTeX file, in a single walk over the recipes."""
+        recipes_dir = output_dir / "recipes"
+        images_dir = output_dir / "images"
+        recipes = [recipe for recipe, _ in validated_recipes]
+        if jobs and jobs > 1 and len(recipes) >= _MIN_PROCESS_POOL_RECIPES:
+            # Drawing placeholders and rendering templates hold the GIL, so spread them over processes;
+            # workers get only picklable state and build their own agent with the platform's default start method
+            executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_recipe_worker,
+                                           initargs=(self.settings, self.jinja_env.loader.searchpath))
+            with executor:
+                list(executor.map(_generate_recipe_in_worker, recipes, repeat(images_dir), repeat(recipes_dir)))
+            return
+        
+        # Compile the template before the threads share it
+        self._get_recipe_template()
+        with ThreadPoolExecutor(max_workers=max(1, min(32, len(recipes)))) as executor:
+            list(executor.map(self._generate_recipe_file, recipes, repeat(images_dir), repeat(recipes_dir)))
+    
+    def _generate_recipe_file(self, recipe: Recipe, images_dir: Path, recipes_dir: Path):
+        """Ensure one recipe has an image and write its LaTeX file."""
+        self._create_missing_recipe_image(recipe, images_dir)
+        self._write_recipe_tex_file(recipe, self._get_recipe_template(), recipes_dir)
+    
+    def _write_recipe_tex_file(self, recipe: Recipe, template: Template, recipes_dir: Path):
+        """Render one recipe with the cookbook template and write its .tex file."""
+        try:
+            # Format recipe data for LaTeX
+            formatted_data = self._format_recipe_for_latex(recipe)
+            
+            # Render the template
+            tex_content = template.render(**formatted_data)
+            
+            # Generate safe filename
+            safe_title = self._make_safe_filename(recipe.title)
+            tex_file = recipes_dir / f"{safe_title}.tex"
+            
+            # Write the file: encode once, then a single binary write (no text-layer buffering)
+            tex_file.write_bytes(tex_content.encode('utf-8'))
+            
+            self.logger.debug(f"Generated LaTeX file: {tex_file.name}")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to generate LaTeX for recipe '{recipe.title}': {e}")
     
     def _format_recipe_for_latex(self, recipe: Recipe) -> Dict[str, Any]:
         """Format recipe data for LaTeX template."""
         
         # Sort and format ingredients
         sorted_ingredients = self._sort_ingredients_by_type(recipe.ingredients)
-        formatted_ingredients = []
-        for ingredient in sorted_ingredients:
-            formatted_ingredients.append(self._format_ingredient_for_tex(ingredient))
+        formatted_ingredients = [self._format_ingredient_for_tex(ingredient) for ingredient in sorted_ingredients]
         
         # Format instructions
-        formatted_instructions = []
-        for instruction in recipe.instructions:
-            formatted_instructions.append(self._escape_latex(instruction.instruction))
+        formatted_instructions = [self._escape_latex(instruction.instruction) for instruction in recipe.instructions]
         
         # Format times and servings
         servings_display = str(recipe.servings) if recipe.servings else ""
@@ -791,11 +1002,11 @@ class CookbookCompilerAgent:
         
         # Handle image path with better fallback handling
         image_path = ""
+        json_image_name = _json_image_filename(recipe.image_url)
         if recipe.image_url and recipe.image_url != "null":
-            if recipe.image_url.startswith("./image/"):
+            if json_image_name:
                 # Convert from JSON format to cookbook format
-                image_filename = recipe.image_url.replace("./image/", "")
-                image_path = f"./images/{image_filename}"
+                image_path = f"./images/{json_image_name}"
             elif recipe.image_url.startswith("./images/"):
                 image_path = recipe.image_url
             else:
@@ -917,54 +1128,24 @@ class CookbookCompilerAgent:
         """Generate the main cookbook LaTeX file."""
         
         # Create input statements for each recipe
-        recipe_inputs = []
-        for recipe, _ in validated_recipes:
-            safe_title = self._make_safe_filename(recipe.title)
-            recipe_inputs.append(f"\\input{{recipes/{safe_title}}}")
+        recipe_inputs = [f"\\input{{recipes/{self._make_safe_filename(recipe.title)}}}" for recipe, _ in validated_recipes]
+        
+        # Escape the metadata once; title and author appear in both files
+        title = self._escape_latex(metadata.title)
+        author = self._escape_latex(metadata.author)
         
         # Generate main.tex content
-        main_content = f"""\\documentclass{{recipebook}}
-
-\\settitle{{{self._escape_latex(metadata.title)}}}
-\\setauthor{{{self._escape_latex(metadata.author)}}}
-
-\\begin{{document}}
-\\input{{titlepage}}
-\\customtableofcontents
-
-{chr(10).join(recipe_inputs)}
-
-\\end{{document}}
-"""
+        main_content = _MAIN_TEX_TEMPLATE.format(title=title, author=author, recipe_inputs="\n".join(recipe_inputs))
         
         # Write main.tex
-        with open(output_dir / "main.tex", 'w', encoding='utf-8') as f:
-            f.write(main_content)
+        (output_dir / "main.tex").write_bytes(main_content.encode('utf-8'))
         
         # Generate titlepage.tex
-        titlepage_content = f"""\\begin{{titlepage}}
-\\centering
-\\vspace*{{2cm}}
-
-{{\\Huge\\textbf{{{self._escape_latex(metadata.title)}}}}}
-
-\\vspace{{1cm}}
-
-{{\\Large by {self._escape_latex(metadata.author)}}}
-
-\\vspace{{2cm}}
-
-{{\\large {self._escape_latex(metadata.description)}}}
-
-\\vfill
-
-{{\\small Compiled on \\today}}
-
-\\end{{titlepage}}
-"""
+        titlepage_content = _TITLEPAGE_TEMPLATE.format(
+            title=title, author=author, description=self._escape_latex(metadata.description)
+        )
         
-        with open(output_dir / "titlepage.tex", 'w', encoding='utf-8') as f:
-            f.write(titlepage_content)
+        (output_dir / "titlepage.tex").write_bytes(titlepage_content.encode('utf-8'))
     
     def _copy_cookbook_resources(self, output_dir: Path, metadata: CookbookMetadata):
         """Copy cookbook class file and other resources."""
@@ -1020,7 +1201,6 @@ class CookbookCompilerAgent:
     def _copy_itakurah_files(self, output_dir: Path):
         """Copy necessary files from itakurah repository."""
         import tempfile
-        import subprocess
         
         # Clone itakurah repo to temporary directory
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -1209,16 +1389,17 @@ class CookbookCompilerAgent:
             self.logger.info("Building cookbook PDF...")
             
             # Change to cookbook directory
-            import os
             original_cwd = os.getcwd()
             os.chdir(output_dir)
             
             try:
-                # Run XeLaTeX twice for proper cross-references
+                # Run XeLaTeX, with a second pass only when cross-references need it
                 for run in range(2):
+                    auxiliary_state = read_auxiliary_state('main')
                     result = subprocess.run(
                         ['xelatex', '-interaction=nonstopmode', 'main.tex'],
-                        capture_output=True,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.PIPE,
                         text=True,
                         timeout=300  # 5 minute timeout
                     )
@@ -1227,6 +1408,9 @@ class CookbookCompilerAgent:
                         self.logger.error(f"XeLaTeX failed (run {run+1}):")
                         self.logger.error(result.stderr)
                         return False
+                    
+                    if not needs_rerun('main', auxiliary_state):
+                        break
                 
                 # Check if PDF was created (we're already in output_dir)
                 pdf_path = Path("main.pdf")
@@ -1253,10 +1437,7 @@ class CookbookCompilerAgent:
     
     def _make_safe_filename(self, title: str) -> str:
         """Convert recipe title to safe filename."""
-        safe = title.lower()
-        safe = safe.replace(' ', '-').replace(',', '').replace('&', 'and').replace("'", '')
-        safe = ''.join(c for c in safe if c.isalnum() or c in '-_')
-        return safe[:50]  # Limit length
+        return _safe_filename(title)
     
     def _validate_image_file(self, image_path: Path) -> bool:
         """Validate that an image file is readable and valid."""
@@ -1307,7 +1488,7 @@ class CookbookCompilerAgent:
             
             # Save the placeholder
             placeholder_path = target_image_dir / "default_placeholder.jpg"
-            img.save(placeholder_path, 'JPEG', quality=85)
+            self._save_jpeg_replacing(img, placeholder_path)
             
             self.logger.info(f"Created default placeholder image: {placeholder_path.name}")
             
@@ -1369,7 +1550,7 @@ class CookbookCompilerAgent:
             # Save the image
             safe_name = self._make_safe_filename(recipe_name)
             image_path = target_image_dir / f"{safe_name}.jpg"
-            img.save(image_path, 'JPEG', quality=85)
+            self._save_jpeg_replacing(img, image_path)
             
             self.logger.info(f"Created recipe placeholder: {image_path.name}")
             
@@ -1539,59 +1720,35 @@ class CookbookCompilerAgent:
     
     def _format_fraction(self, decimal: float) -> str:
         """Convert decimal to readable fraction."""
+        return _format_fraction(decimal)
+    
+    def _create_missing_recipe_image(self, recipe: Recipe, images_dir: Path):
+        """Create a placeholder image for a recipe that doesn't have a corresponding image file."""
+        safe_title = self._make_safe_filename(recipe.title)
+        
+        # Check if recipe has an image
+        expected_image_files = [
+            images_dir / f"{safe_title}.jpg",
+            images_dir / f"{safe_title}.jpeg", 
+            images_dir / f"{safe_title}.png"
+        ]
         
-        # Common cooking fractions
-        fractions = {
-            0.125: "1/8",
-            0.25: "1/4", 
-            0.33: "1/3",
-            0.375: "3/8",
-            0.5: "1/2",
-            0.67: "2/3",
-            0.625: "5/8",
-            0.75: "3/4",
-            0.875: "7/8"
-        }
-        
-        # Find closest fraction
-        closest = min(fractions.keys(), key=lambda x: abs(x - decimal))
-        if abs(closest - decimal) < 0.05:  # Close enough
-            return fractions[closest]
+        # Also check for the image referenced in the recipe JSON
+        json_image_name = _json_image_filename(recipe.image_url)
+        if json_image_name:
+            expected_image_files.append(images_dir / json_image_name)
         
-        # Return decimal with reasonable precision
-        return f"{decimal:.2f}".rstrip('0').rstrip('.')
-    
-    def _create_missing_recipe_images(self, validated_recipes: List[Tuple[Recipe, RecipeValidationResult]], images_dir: Path):
-        """Create placeholder images for recipes that don't have corresponding image files."""
+        # Check if any of the expected images exist
+        has_image = any(img_path.exists() for img_path in expected_image_files)
         
-        for recipe, validation in validated_recipes:
-            safe_title = self._make_safe_filename(recipe.title)
-            
-            # Check if recipe has an image
-            expected_image_files = [
-                images_dir / f"{safe_title}.jpg",
-                images_dir / f"{safe_title}.jpeg", 
-                images_dir / f"{safe_title}.png"
-            ]
-            
-            # Also check for the image referenced in the recipe JSON
-            if recipe.image_url and recipe.image_url.startswith("./image/"):
-                json_image_name = recipe.image_url.replace("./image/", "")
-                expected_image_files.append(images_dir / json_image_name)
-            
-            # Check if any of the expected images exist
-            has_image = any(img_path.exists() for img_path in expected_image_files)
-            
-            if not has_image:
-                self.logger.info(f"Creating placeholder image for recipe: {recipe.title}")
-                self._create_recipe_placeholder_image(images_dir, safe_title)
+        if not has_image:
+            self.logger.info(f"Creating placeholder image for recipe: {recipe.title}")
+            self._create_recipe_placeholder_image(images_dir, safe_title)
     
     def _validate_recipe_pdf_layout(self, recipe: Recipe, max_pages: int) -> Optional[float]:
         """Validate recipe by actually compiling to PDF and checking page count."""
         
         import tempfile
-        import os
-        import subprocess
         
         try:
             with tempfile.TemporaryDirectory() as temp_dir:
@@ -1602,8 +1759,7 @@ class CookbookCompilerAgent:
                 
                 # Generate recipe LaTeX file
                 recipe_data = self._format_recipe_for_latex(recipe)
-                template = self.jinja_env.get_template("cookbook_recipe.tex")
-                recipe_content = template.render(**recipe_data)
+                recipe_content = self._get_recipe_template().render(**recipe_data)
                 
                 # Create test document
                 test_doc = f"""\\documentclass{{recipebook}}
@@ -1794,8 +1950,9 @@ class CookbookCompilerAgent:
         return metadata
     
     def add_recipes_to_cookbook(self, new_json_dir: Path, image_dir: Path, cookbook_dir: Path, 
-                               max_pages_per_recipe: int = 1, auto_build: bool = True) -> bool:
-        """Add new recipes to an existing cookbook."""
+                               max_pages_per_recipe: int = 1, auto_build: bool = True,
+                               json_files: Optional[List[Path]] = None) -> bool:
+        """Add new recipes to an existing cookbook (only json_files from new_json_dir, when given)."""
         
         self.logger.info(f"Adding recipes from {new_json_dir} to existing cookbook {cookbook_dir}")
         
@@ -1805,7 +1962,10 @@ class CookbookCompilerAgent:
             metadata = self._extract_cookbook_metadata(main_tex_path)
             
             # Load new recipes
-            new_recipes = self._load_recipes(new_json_dir)
+            if json_files is not None:
+                new_recipes = self._load_recipe_files(json_files)
+            else:
+                new_recipes = self._load_recipes(new_json_dir)
             if not new_recipes:
                 self.logger.warning("No new recipes found to add")
                 return False
@@ -1852,7 +2012,8 @@ class CookbookCompilerAgent:
             safe_title = self._make_safe_filename(recipe.title)
             new_recipe_names.add(safe_title)
         
-        if not source_image_dir.exists():
+        source_files = self._scan_source_images(source_image_dir)
+        if source_files is None:
             self.logger.warning(f"Source image directory not found: {source_image_dir}")
             # Create placeholder images for new recipes
             for recipe in new_recipes:
@@ -1862,24 +2023,12 @@ class CookbookCompilerAgent:
         
         # Copy images for new recipes only
         copied_count = 0
-        for image_file in source_image_dir.iterdir():
-            if image_file.is_file() and image_file.suffix.lower() in ['.jpg', '.jpeg', '.png', '.gif']:
-                image_name = image_file.stem
-                
-                # Check if this image corresponds to a new recipe
-                if image_name in new_recipe_names:
-                    try:
-                        target_path = target_image_dir / image_file.name
-                        
-                        if self._validate_image_file(image_file):
-                            shutil.copy2(image_file, target_path)
-                            copied_count += 1
-                            self.logger.debug(f"Copied image for new recipe: {image_file.name}")
-                        else:
-                            self.logger.warning(f"Invalid image file skipped: {image_file.name}")
-                            
-                    except Exception as e:
-                        self.logger.warning(f"Failed to copy image {image_file.name}: {e}")
+        for image_file in source_files[0]:
+            image_name = image_file.stem
+            
+            # Check if this image corresponds to a new recipe
+            if image_name in new_recipe_names and self._copy_image_file(image_file, target_image_dir):
+                copied_count += 1
         
         # Create placeholder images for new recipes that don't have images
         for recipe in new_recipes:
@@ -11,7 +11,13 @@ from config.settings import Settings
 from ..models.recipe import Recipe, Ingredient, InstructionStep, ParsedIngredient, NutritionInfo
 from ..models.recipe import DifficultyLevel, CuisineType
 from ..models.conversion import smart_round
-from ..utils.density_lookup import DensityLookup
+from ..utils.density_lookup import get_density_lookup
+
+# First integer / decimal in time, servings and quantity strings (search stops at the first match)
+_INTEGER_RE = re.compile(r'\d+')
+_NUMBER_RE = re.compile(r'\d+\.?\d*')
+# Phrases marking an ingredient as optional, matched in one case-insensitive scan
+_OPTIONAL_RE = re.compile(r'optional|to taste|if desired|garnish', re.IGNORECASE)
 
 class ParserAgent(BaseAgent):
     """Agent responsible for parsing and structuring recipe data."""
@@ -19,7 +25,7 @@ class ParserAgent(BaseAgent):
     def __init__(self, settings: Settings):
         super().__init__(settings)
         self.llm_manager = LLMManager(settings)
-        self.density_lookup = DensityLookup(usda_timeout=settings.processing.usda_api_timeout)
+        self.density_lookup = get_density_lookup(usda_timeout=settings.processing.usda_api_timeout)
         self.difficulty_keywords = {
             'easy': ['easy', 'simple', 'quick', 'beginner', 'basic'],
             'medium': ['medium', 'intermediate', 'moderate'],
@@ -137,9 +143,6 @@ class ParserAgent(BaseAgent):
                 ingredient.optional = self._is_optional_ingredient(ingredient_text)
                 ingredient.alternatives = self._extract_alternatives(ingredient_text)
                 
-                # Density lookup and metric/weight calculations
-                self._enhance_ingredient_with_density(ingredient)
-                
                 ingredients.append(ingredient)
                 
             except Exception as e:
@@ -152,6 +155,14 @@ class ParserAgent(BaseAgent):
                 )
                 ingredients.append(ingredient)
         
+        # Density lookup and metric/weight calculations, with USDA queries for the recipe made concurrently
+        self.density_lookup.prefetch_densities([ingredient.name for ingredient in ingredients if ingredient.quantity])
+        for ingredient in ingredients:
+            try:
+                self._enhance_ingredient_with_density(ingredient)
+            except Exception as e:
+                self.logger.warning(f"Failed to add metric amounts for '{ingredient.original_text}': {e}")
+        
         return ingredients
     
     def _parse_instructions(self, raw_instructions: List[str]) -> List[InstructionStep]:
@@ -463,9 +474,9 @@ class ParserAgent(BaseAgent):
         
         if isinstance(time_str, str):
             # Extract numbers from time string
-            numbers = re.findall(r'\d+', time_str)
-            if numbers:
-                time_value = int(numbers[0])
+            number = _INTEGER_RE.search(time_str)
+            if number:
+                time_value = int(number.group())
                 # Convert hours to minutes if needed
                 if 'hour' in time_str.lower():
                     time_value *= 60
@@ -483,9 +494,9 @@ class ParserAgent(BaseAgent):
         
         if isinstance(servings_str, str):
             # Extract first number from servings string
-            numbers = re.findall(r'\d+', servings_str)
-            if numbers:
-                return int(numbers[0])
+            number = _INTEGER_RE.search(servings_str)
+            if number:
+                return int(number.group())
         
         return None
     
@@ -508,16 +519,15 @@ class ParserAgent(BaseAgent):
                         pass
             
             # Extract first number
-            numbers = re.findall(r'\d+\.?\d*', quantity_str)
-            if numbers:
-                return float(numbers[0])
+            number = _NUMBER_RE.search(quantity_str)
+            if number:
+                return float(number.group())
         
         return None
     
     def _is_optional_ingredient(self, ingredient_text: str) -> bool:
         """Check if ingredient is optional."""
-        optional_keywords = ['optional', 'to taste', 'if desired', 'garnish']
-        return any(keyword in ingredient_text.lower() for keyword in optional_keywords)
+        return _OPTIONAL_RE.search(ingredient_text) is not None
     
     def _extract_alternatives(self, ingredient_text: str) -> List[str]:
         """Extract alternative ingredients."""
@@ -663,8 +673,8 @@ class ParserAgent(BaseAgent):
             self.logger.debug(f"No density found for ingredient: {ingredient.name}")
             return
         
-        density_g_ml = density_info['density_g_ml']
-        self.logger.debug(f"Found density {density_g_ml} g/ml for {ingredient.name} (match: {density_info['match_score']:.2f})")
+        density_g_ml = density_info.density_g_ml
+        self.logger.debug(f"Found density {density_g_ml} g/ml for {ingredient.name} (match: {density_info.match_score:.2f})")
         
         # Convert volume units to metric and calculate weight
         if ingredient.unit and self._is_volume_unit(ingredient.unit):
@@ -1,44 +1,582 @@
 """
 Renderer Agent - Generates HTML and LaTeX output for recipes
 """
+import hashlib
+import logging
+from bisect import bisect_left
 import os
-from typing import Dict, Any, List, Optional
+import re
+import shutil
+import threading
+import time
+from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader, Template
+from functools import lru_cache
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+from markupsafe import Markup, escape
 import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 from ..models.recipe import Recipe
 from ..agents.base import BaseAgent, AgentResult
 from config.settings import Settings
 
+class _ImageNameTable(dict):
+    """str.translate table for image names: keeps letters and digits, spells '&' as 'and', drops the rest."""
+    
+    def __missing__(self, codepoint: int) -> Optional[str]:
+        char = chr(codepoint)
+        value = char if char.isalnum() else None
+        self[codepoint] = value
+        return value
+
+# Filled in lazily, one entry per distinct character seen in a title
+_IMAGE_NAME_TABLE = _ImageNameTable({ord('&'): 'and'})
+
+# Characters dropped from, and runs collapsed to '-' in, safe filenames
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w\s-]')
+_FILENAME_SEPARATOR_RE = re.compile(r'[-\s]+')
+
+# Timer mentions in instructions like "10 minutes", "5 mins", "1 hour", etc.
+_TIMER_RE = re.compile(r'(\d+)\s*(minute|minutes|min|mins|hour|hours|hr|hrs)(?:\s+(\w+))?')
+
+# Words in titles and ingredient names
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Common recipe words skipped when picking image search keywords
+_COMMON_TITLE_WORDS = frozenset({
+    'recipe', 'easy', 'best', 'homemade', 'simple', 'quick', 'perfect',
+    'delicious', 'amazing', 'ultimate', 'classic', 'traditional', 'authentic',
+    'healthy', 'low', 'fat', 'gluten', 'free', 'vegan', 'vegetarian',
+    'how', 'to', 'make', 'bake', 'cook', 'prepare', 'with', 'and', 'or',
+    'the', 'a', 'an', 'for', 'in', 'on', 'of', 'style', 'minute', 'hour',
+    'from', 'using', 'scratch', 'step', 'by', 'home', 'made'
+})
+
+# Food-specific keywords to prioritize (proteins, vegetables, grains, dairy, desserts, dishes)
+_FOOD_WORDS = frozenset({
+    'chicken', 'beef', 'pork', 'fish', 'salmon', 'tuna', 'turkey', 'lamb', 'shrimp', 'crab', 'eggs',
+    'tomato', 'potato', 'onion', 'carrot', 'broccoli', 'spinach', 'mushroom', 'pepper', 'eggplant',
+    'pasta', 'rice', 'bread', 'noodles', 'quinoa', 'oats', 'flour',
+    'cheese', 'milk', 'butter', 'cream', 'yogurt',
+    'cake', 'cookie', 'pie', 'chocolate', 'vanilla', 'strawberry', 'banana', 'apple',
+    'soup', 'salad', 'sandwich', 'pizza', 'burger', 'taco', 'curry', 'stir-fry', 'pancakes'
+})
+
+# Named HTML entities that might be in scraped text
+_HTML_ENTITIES = {
+    'amp': '&',
+    'lt': '<',
+    'gt': '>',
+    'quot': '"',
+    'apos': "'",
+    'nbsp': ' ',
+    'ndash': '-',
+    'mdash': '--',
+    'hellip': '...',
+    '####39': "'",  # Sometimes appears as malformed entity
+}
+
+# Named, decimal (&#39;) and hex (&#x27;) entities in a single pattern
+_HTML_ENTITY_RE = re.compile(r'&(?:(amp|lt|gt|quot|apos|nbsp|ndash|mdash|hellip|####39)|#(\d+)|#x([0-9a-fA-F]+));')
+
+# LaTeX special characters
+_LATEX_SPECIAL_CHARS = {
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '^': r'\textasciicircum{}',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '\\': r'\textbackslash{}',
+}
+_LATEX_TRANSLATION = str.maketrans(_LATEX_SPECIAL_CHARS)
+
+# Cheap probe: text without any of these needs no escaping ('&' also covers HTML entities)
+_NEEDS_ESCAPE_RE = re.compile(r'[&%$#^_{}~\\]')
+
+def _replace_html_entity(match: re.Match) -> str:
+    """Decode a matched HTML entity."""
+    name, decimal, hexadecimal = match.groups()
+    if name:
+        return _HTML_ENTITIES[name]
+    try:
+        return chr(int(decimal)) if decimal else chr(int(hexadecimal, 16))
+    except (ValueError, OverflowError):
+        return match.group(0)
+
+# Recipe fields left out of the rendered JSON output
+JSON_EXCLUDED_FIELDS = {
+    'yield_amount', 'difficulty', 'cuisine', 'meal_type',
+    'dietary_restrictions', 'source', 'equipment_needed'
+}
+
+# Local checkout of the itakurah/LaTeX-Cookbook class files, refreshed at most weekly
+_ITAKURAH_REPO_URL = "https://github.com/itakurah/LaTeX-Cookbook.git"
+_ITAKURAH_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "recipes_agent" / "latex-cookbook"
+_ITAKURAH_MAX_AGE = 7 * 24 * 3600
+_ITAKURAH_LOCK = threading.Lock()
+
+# Common cooking fractions that awkward decimals snap to
+_COMMON_FRACTIONS = (
+    (0.125, "1/8"), (0.25, "1/4"), (0.333, "1/3"), (0.375, "3/8"),
+    (0.5, "1/2"), (0.625, "5/8"), (0.667, "2/3"), (0.75, "3/4"), (0.875, "7/8")
+)
+_COMMON_FRACTION_DECIMALS = tuple(value for value, _ in _COMMON_FRACTIONS)
+
+def _limit_denominator(decimal: float, max_denominator: int = 16) -> tuple:
+    """Closest (numerator, denominator) to decimal with a small denominator, like Fraction.limit_denominator."""
+    # Exact integer arithmetic on the float's ratio p/q, so ties resolve exactly as Fraction does
+    p, q = decimal.as_integer_ratio()
+    best_numerator, best_denominator, best_error = 0, 1, None
+    for denominator in range(1, max_denominator + 1):
+        numerator = (2 * p * denominator + q) // (2 * q)  # round(p * denominator / q)
+        error = abs(numerator * q - p * denominator)  # |numerator/denominator - p/q| * q * denominator
+        if best_error is None or error * best_denominator < best_error * denominator:
+            best_numerator, best_denominator, best_error = numerator, denominator, error
+    return best_numerator, best_denominator
+
+@lru_cache(maxsize=512)
+def _decimal_to_fraction(decimal: float) -> str:
+    """Convert decimal to fraction string with cooking-friendly denominators."""
+    # Find the closest common fraction: the table is sorted, so only the neighbours around the insertion point can win
+    index = bisect_left(_COMMON_FRACTION_DECIMALS, decimal)
+    neighbours = _COMMON_FRACTIONS[max(0, index - 1):index + 1]
+    closest_decimal, closest_text = min(neighbours, key=lambda item: abs(item[0] - decimal))
+    if abs(closest_decimal - decimal) < 0.05:  # Within 5% tolerance
+        return closest_text
+    
+    # Otherwise use standard fraction conversion with reasonable limit
+    numerator, denominator = _limit_denominator(decimal, 16)
+    if denominator == 1:
+        return str(numerator)
+    
+    # If denominator is still awkward, round to decimal
+    if denominator > 8:
+        return f"{decimal:.1f}".rstrip('0').rstrip('.')
+    
+    return f"{numerator}/{denominator}"
+
+@lru_cache(maxsize=64)
+def _enum_display_value(enum_field) -> str:
+    """Get display value from enum field, handling both enum objects and strings."""
+    if not enum_field:
+        return 'Unknown'
+    
+    # If it's already a string (from serialization), use it directly
+    if isinstance(enum_field, str):
+        return enum_field.title()
+    
+    # If it's an enum object, get the value
+    if hasattr(enum_field, 'value'):
+        return enum_field.value.title()
+    
+    # Fallback to string representation
+    return str(enum_field).title()
+
+@lru_cache(maxsize=512)
+def _format_time(minutes: Optional[int]) -> Optional[str]:
+    """Format time in minutes to human readable string."""
+    if not minutes:
+        return None
+    
+    if minutes < 60:
+        return f"{minutes} min"
+    else:
+        hours = minutes // 60
+        mins = minutes % 60
+        if mins == 0:
+            return f"{hours} hr"
+        else:
+            return f"{hours} hr {mins} min"
+
+@lru_cache(maxsize=256)
+def _format_quantity_for_display(quantity: float) -> str:
+    """Format quantity for display with proper fractions (recipes reuse a handful of quantities)."""
+    if quantity == int(quantity):
+        return str(int(quantity))
+    return _decimal_to_fraction(quantity)
+
+def _bytecode_cache(env_name: str) -> FileSystemBytecodeCache:
+    """On-disk cache of compiled templates, so a new process skips re-parsing them."""
+    # Jinja keys bytecode by template name and source, not environment options, so the
+    # autoescaping HTML and the LaTeX environments need separate files. The default
+    # directory is a private per-user folder under the system temp dir.
+    return FileSystemBytecodeCache(pattern=f'__recipes_agent_{env_name}_%s.cache')
+
+# Default templates written when the templates directory lacks them (strangetom-style HTML, cookbook-style LaTeX)
+_DEFAULT_HTML_TEMPLATE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{ recipe.title }}</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f8f9fa;
+        }
+        .recipe-card {
+            background: white;
+            border-radius: 12px;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+            overflow: hidden;
+            margin-bottom: 2rem;
+        }
+        .recipe-header {
+            padding: 2rem;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+        }
+        .recipe-title {
+            font-size: 2.5rem;
+            font-weight: 700;
+            margin: 0 0 0.5rem 0;
+        }
+        .recipe-description {
+            font-size: 1.1rem;
+            opacity: 0.9;
+            margin: 0;
+        }
+        .recipe-meta {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
+            gap: 1rem;
+            padding: 1.5rem 2rem;
+            background: #f8f9fa;
+            border-bottom: 1px solid #e9ecef;
+        }
+        .meta-item {
+            text-align: center;
+        }
+        .meta-label {
+            font-size: 0.875rem;
+            color: #6c757d;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+            margin-bottom: 0.25rem;
+        }
+        .meta-value {
+            font-size: 1.25rem;
+            font-weight: 600;
+            color: #495057;
+        }
+        .recipe-content {
+            padding: 2rem;
+        }
+        .section {
+            margin-bottom: 2rem;
+        }
+        .section-title {
+            font-size: 1.5rem;
+            font-weight: 600;
+            color: #495057;
+            margin-bottom: 1rem;
+            padding-bottom: 0.5rem;
+            border-bottom: 2px solid #e9ecef;
+        }
+        .ingredients-list {
+            list-style: none;
+            padding: 0;
+        }
+        .ingredient-item {
+            padding: 0.75rem 0;
+            border-bottom: 1px solid #f8f9fa;
+            display: flex;
+            align-items: center;
+        }
+        .ingredient-item:last-child {
+            border-bottom: none;
+        }
+        .ingredient-quantity {
+            font-weight: 600;
+            color: #667eea;
+            min-width: 80px;
+            margin-right: 1rem;
+        }
+        .ingredient-name {
+            flex: 1;
+        }
+        .instructions-list {
+            counter-reset: step-counter;
+        }
+        .instruction-step {
+            counter-increment: step-counter;
+            margin-bottom: 1.5rem;
+            padding: 1rem;
+            background: #f8f9fa;
+            border-radius: 8px;
+            border-left: 4px solid #667eea;
+        }
+        .instruction-step::before {
+            content: counter(step-counter);
+            background: #667eea;
+            color: white;
+            width: 30px;
+            height: 30px;
+            border-radius: 50%;
+            display: inline-flex;
+            align-items: center;
+            justify-content: center;
+            font-weight: 600;
+            margin-right: 1rem;
+            float: left;
+        }
+        .instruction-text {
+            margin-left: 46px;
+        }
+        .tags {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 0.5rem;
+            margin-top: 1rem;
+        }
+        .tag {
+            background: #e9ecef;
+            color: #495057;
+            padding: 0.25rem 0.75rem;
+            border-radius: 20px;
+            font-size: 0.875rem;
+        }
+        .footer {
+            text-align: center;
+            padding: 1rem;
+            color: #6c757d;
+            font-size: 0.875rem;
+            border-top: 1px solid #e9ecef;
+        }
+    </style>
+</head>
+<body>
+    <div class="recipe-card">
+        <div class="recipe-header">
+            <h1 class="recipe-title">{{ recipe.title }}</h1>
+            {% if recipe.description %}
+            <p class="recipe-description">{{ recipe.description }}</p>
+            {% endif %}
+        </div>
+        
+        <div class="recipe-meta">
+            {% if recipe.servings %}
+            <div class="meta-item">
+                <div class="meta-label">Servings</div>
+                <div class="meta-value">{{ recipe.servings }}</div>
+            </div>
+            {% endif %}
+            {% if prep_time_formatted %}
+            <div class="meta-item">
+                <div class="meta-label">Prep Time</div>
+                <div class="meta-value">{{ prep_time_formatted }}</div>
+            </div>
+            {% endif %}
+            {% if cook_time_formatted %}
+            <div class="meta-item">
+                <div class="meta-label">Cook Time</div>
+                <div class="meta-value">{{ cook_time_formatted }}</div>
+            </div>
+            {% endif %}
+            {% if total_time_formatted %}
+            <div class="meta-item">
+                <div class="meta-label">Total Time</div>
+                <div class="meta-value">{{ total_time_formatted }}</div>
+            </div>
+            {% endif %}
+            {% if recipe.difficulty %}
+            <div class="meta-item">
+                <div class="meta-label">Difficulty</div>
+                <div class="meta-value">{{ difficulty_display }}</div>
+            </div>
+            {% endif %}
+        </div>
+        
+        <div class="recipe-content">
+            {% if recipe.ingredients %}
+            <div class="section">
+                <h2 class="section-title">Ingredients</h2>
+                <ul class="ingredients-list">
+                    {% for ingredient in recipe.ingredients %}
+                    <li class="ingredient-item">
+                        <span class="ingredient-quantity">
+                            {% if ingredient.quantity %}{{ ingredient.quantity }}{% endif %}
+                            {% if ingredient.unit %} {{ ingredient.unit }}{% endif %}
+                        </span>
+                        <span class="ingredient-name">
+                            {{ ingredient.name }}
+                            {% if ingredient.preparation %}, {{ ingredient.preparation }}{% endif %}
+                        </span>
+                    </li>
+                    {% endfor %}
+                </ul>
+            </div>
+            {% endif %}
+            
+            {% if recipe.instructions %}
+            <div class="section">
+                <h2 class="section-title">Instructions</h2>
+                <div class="instructions-list">
+                    {% for instruction in recipe.instructions %}
+                    <div class="instruction-step">
+                        <div class="instruction-text">{{ instruction.instruction }}</div>
+                    </div>
+                    {% endfor %}
+                </div>
+            </div>
+            {% endif %}
+            
+            {% if recipe.tags %}
+            <div class="section">
+                <h2 class="section-title">Tags</h2>
+                <div class="tags">
+                    {% for tag in recipe.tags %}
+                    <span class="tag">{{ tag }}</span>
+                    {% endfor %}
+                </div>
+            </div>
+            {% endif %}
+        </div>
+        
+        <div class="footer">
+            Generated on {{ generated_date }}
+            {% if recipe.source %} | Source: {{ recipe.source }}{% endif %}
+        </div>
+    </div>
+</body>
+</html>'''
+
+_DEFAULT_LATEX_TEMPLATE = r'''% Recipe: {{ recipe.title }}
+% Generated on {{ generated_date }}
+
+\begin{recipe}
+    [{{ recipe.title|e }}]
+    [{{ servings_display }}]
+    [{{ time_display }}]
+
+{% if recipe.description %}
+{{ recipe.description|e }}
+
+{% endif %}
+\begin{ingredients}
+{% for ingredient in recipe.ingredients %}
+    \ingredient{ {{- ingredient|format_ingredient|e -}} }
+{% endfor %}
+\end{ingredients}
+
+\begin{steps}
+{% for instruction in recipe.instructions %}
+    \step {{ instruction.instruction|e }}
+{% endfor %}
+\end{steps}
+
+{% if recipe.tags %}
+\begin{center}
+\textit{Tags: {{ recipe.tags|join(', ')|e }}}
+\end{center}
+{% endif %}
+
+\end{recipe}
+'''
+
 class RenderResult:
     """Result of rendering operation."""
-    def __init__(self, output_path: Path, format_type: str, success: bool = True, error: str = None):
+    def __init__(self, output_path: Path, format_type: str, success: bool = True, error: str = None,
+                 file_size: Optional[int] = None):
         self.output_path = output_path
         self.format_type = format_type
         self.success = success
         self.error = error
+        self.file_size = file_size  # Bytes written, when known at write time
+
+@dataclass(slots=True)
+class RecipeView:
+    """Display-ready recipe values shared by the templates, computed once per render."""
+    title: str
+    description: Optional[str]
+    difficulty_display: str
+    cuisine_display: str
+    tags: List[str]  # Derived tags (cuisine, difficulty, duration), not recipe.tags
+    prep_time_display: Optional[str]
+    cook_time_display: Optional[str]
+    total_time_display: Optional[str]
+    times_display: str
 
 class RendererAgent(BaseAgent):
     """Agent responsible for rendering recipes to HTML and LaTeX formats."""
     
+    # Template directories whose default templates were already ensured in this process
+    _default_templates_checked = set()
+    
     def __init__(self, settings: Settings):
         super().__init__(settings)
         self.output_dir = Path(settings.output.output_dir)
         self.templates_dir = Path(settings.output.templates_dir)
         self.jinja_env = self._setup_jinja_environment()
+        # Filters are registered once here: Jinja environments must not change after templates load,
+        # and render_multiple renders on several threads
+        self.jinja_env.filters['fmt_ingredient_latex'] = self._format_cookbook_ingredient
+        self.jinja_env.filters['format_quantity'] = self._format_quantity_filter
+        self.jinja_env.filters['replace_timers'] = self._replace_timers
+        self.jinja_env.filters['add_ingredient_tooltips'] = self._add_ingredient_tooltips
+        self.latex_env = self._setup_latex_environment()
         self._ensure_directories()
         self._create_default_templates()
+        self._in_batch = False
+        self._refresh_timestamps()
+        
+        # Per-recipe memos so repeated renders of the same recipe skip recomputation
+        self._safe_name_cache: Dict[str, str] = {}
+        self._image_cache: Dict[tuple, str] = {}
+        
+        # File names present in each images directory, listed once instead of a stat per recipe
+        self._image_manifests: Dict[str, set] = {}
+        
+        # Compiled Jinja templates, keyed by (environment name, template name)
+        self._compiled_templates: Dict[tuple, Template] = {}
+        
+        # Shared HTTP session for image downloads, placeholder fonts and background, created on first use;
+        # the lock keeps render_multiple's threads from building them twice
+        self._http_session = None
+        self._fonts = None
+        self._placeholder_base = None
+        self._lazy_init_lock = threading.Lock()
     
     def _setup_jinja_environment(self) -> Environment:
         """Setup Jinja2 template environment."""
         return Environment(
             loader=FileSystemLoader(self.templates_dir),
-            autoescape=True,
+            # HTML-escape only markup templates; LaTeX output goes through latex_env and its own escaping
+            autoescape=select_autoescape(['html', 'htm', 'xml']),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=False,
+            cache_size=-1,
+            bytecode_cache=_bytecode_cache('html')
+        )
+    
+    def _setup_latex_environment(self) -> Environment:
+        """Setup Jinja2 environment for LaTeX templates, escaping via the `e` filter at render time."""
+        env = Environment(
+            loader=FileSystemLoader(self.templates_dir),
+            autoescape=False,
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            auto_reload=False,
+            cache_size=-1,
+            bytecode_cache=_bytecode_cache('latex')
         )
+        env.filters['e'] = self._escape_latex
+        env.filters['format_ingredient'] = self._format_ingredient
+        env.filters['fmt_ingredient_latex'] = self._format_cookbook_ingredient
+        return env
     
     def _ensure_directories(self):
         """Ensure output and template directories exist."""
@@ -47,6 +585,40 @@ class RendererAgent(BaseAgent):
         (self.output_dir / "latex").mkdir(exist_ok=True)
         (self.output_dir / "json").mkdir(exist_ok=True)
         self.templates_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Plain-string subdirectory paths for the default output directory
+        self._output_subdirs = {
+            subdir: os.path.join(self.output_dir, subdir) for subdir in ("html", "latex", "json")
+        }
+    
+    def _output_file(self, output_dir: Path, subdir: str, filename: str, ensure_dir: bool = False) -> str:
+        """Build an output file path as a plain string, avoiding Path allocations on the render path."""
+        if output_dir is self.output_dir:
+            directory = self._output_subdirs[subdir]
+        else:
+            directory = os.path.join(output_dir, subdir)
+        if ensure_dir:
+            os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, filename)
+    
+    def _write_output(self, path: Union[str, Path], content: str) -> int:
+        """Encode content once and write it straight to the file descriptor; returns bytes written."""
+        data = memoryview(content.encode('utf-8'))
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            remaining = data
+            while remaining:
+                remaining = remaining[os.write(fd, remaining):]
+        finally:
+            os.close(fd)
+        return len(data)
+    
+    def _refresh_timestamps(self):
+        """Capture the current time once and cache the formatted strings used by templates."""
+        now = datetime.now()
+        self._generated_date = now.strftime("%Y-%m-%d")
+        self._generated_datetime = now.strftime("%Y-%m-%d %H:%M")
+        self._rendered_at = now.isoformat()
     
     def render(self, recipe: Recipe, format_type: str, output_dir: Optional[Path] = None) -> AgentResult[RenderResult]:
         """
@@ -61,20 +633,26 @@ class RendererAgent(BaseAgent):
             AgentResult with RenderResult
         """
         try:
-            self.logger.info(f"**RENDERING** - Rendering recipe '{recipe.title}' to {format_type}")
+            # Inside render_multiple, per-recipe progress drops to DEBUG; the batch logs one summary
+            log_level = logging.DEBUG if self._in_batch else logging.INFO
+            self.logger.log(log_level, f"**RENDERING** - Rendering recipe '{recipe.title}' to {format_type}")
             
             output_base = output_dir or self.output_dir
             
+            # Batches share one timestamp, set up by render_multiple
+            if not self._in_batch:
+                self._refresh_timestamps()
+            
             if format_type.lower() == "html":
-                result = self._render_html(recipe, output_base)
+                result = self._render_html(recipe, output_base, self._build_recipe_view(recipe))
             elif format_type.lower() == "latex":
-                result = self._render_latex(recipe, output_base)
+                result = self._render_latex(recipe, output_base, self._build_recipe_view(recipe))
             elif format_type.lower() == "json":
                 result = self._render_json(recipe, output_base)
             elif format_type.lower() == "strangetom":
-                result = self._render_strangetom(recipe, output_base)
+                result = self._render_strangetom(recipe, output_base, self._build_recipe_view(recipe))
             elif format_type.lower() == "interactive":
-                result = self._render_interactive(recipe, output_base)
+                result = self._render_interactive(recipe, output_base, self._build_recipe_view(recipe))
             elif format_type.lower() == "cookbook":
                 result = self._render_cookbook(recipe, output_base)
             else:
@@ -84,14 +662,14 @@ class RendererAgent(BaseAgent):
                 )
             
             if result.success:
-                self.logger.info(f"**RENDERING** - Successfully rendered to: {result.output_path}")
+                self.logger.log(log_level, f"**RENDERING** - Successfully rendered to: {result.output_path}")
                 return AgentResult(
                     success=True,
                     data=result,
                     metadata={
                         'format': format_type,
                         'output_path': str(result.output_path),
-                        'file_size': result.output_path.stat().st_size if result.output_path.exists() else 0
+                        'file_size': result.file_size if result.file_size is not None else result.output_path.stat().st_size
                     }
                 )
             else:
@@ -131,56 +709,54 @@ class RendererAgent(BaseAgent):
         except Exception as e:
             return self._handle_error(e, f"Error rendering recipe from JSON {json_path} to {format_type}")
     
-    def _render_html(self, recipe: Recipe, output_dir: Path) -> RenderResult:
+    def _render_html(self, recipe: Recipe, output_dir: Path, view: Optional[RecipeView] = None) -> RenderResult:
         """Render recipe to HTML format."""
         try:
-            # Load HTML template
-            template = self.jinja_env.get_template("recipe_html.html")
+            view = view or self._build_recipe_view(recipe)
             
             # Prepare template context
             context = {
                 'recipe': recipe,
-                'generated_date': datetime.now().strftime("%Y-%m-%d %H:%M"),
+                'generated_date': self._generated_datetime,
                 'include_nutrition': self.settings.output.include_nutrition,
                 'include_metadata': self.settings.output.include_metadata,
-                'total_time_formatted': self._format_time(recipe.total_time),
-                'prep_time_formatted': self._format_time(recipe.prep_time),
-                'cook_time_formatted': self._format_time(recipe.cook_time),
-                'difficulty_display': self._get_enum_display_value(recipe.difficulty),
-                'cuisine_display': self._get_enum_display_value(recipe.cuisine)
+                'view': view,
+                'total_time_formatted': view.total_time_display,
+                'prep_time_formatted': view.prep_time_display,
+                'cook_time_formatted': view.cook_time_display,
+                'difficulty_display': view.difficulty_display,
+                'cuisine_display': view.cuisine_display
             }
             
             # Render template
-            html_content = template.render(**context)
+            html_content = self._get_template("recipe_html.html").render(**context)
             
             # Save to file
             safe_title = self._make_safe_filename(recipe.title)
-            output_path = output_dir / "html" / f"{safe_title}.html"
+            output_path = self._output_file(output_dir, "html", f"{safe_title}.html")
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            file_size = self._write_output(output_path, html_content)
             
-            return RenderResult(output_path, "html", True)
+            return RenderResult(Path(output_path), "html", True, file_size=file_size)
             
         except Exception as e:
             return RenderResult(None, "html", False, str(e))
     
-    def _render_latex(self, recipe: Recipe, output_dir: Path) -> RenderResult:
+    def _render_latex(self, recipe: Recipe, output_dir: Path, view: Optional[RecipeView] = None) -> RenderResult:
         """Render recipe to LaTeX format."""
         try:
-            # Load LaTeX template
-            template = self.jinja_env.get_template("recipe_latex.tex")
+            view = view or self._build_recipe_view(recipe)
+            
+            # Load LaTeX template (fields are escaped by the template's `e` filter)
+            template = self._get_template("recipe_latex.tex", latex=True)
             
             # Prepare template context
             context = {
                 'recipe': recipe,
-                'generated_date': datetime.now().strftime("%Y-%m-%d"),
-                'escaped_title': self._escape_latex(recipe.title),
-                'escaped_description': self._escape_latex(recipe.description) if recipe.description else None,
-                'escaped_ingredients': [self._escape_latex(self._format_ingredient(ing)) for ing in recipe.ingredients],
-                'escaped_instructions': [self._escape_latex(inst.instruction) for inst in recipe.instructions],
+                'generated_date': self._generated_date,
                 'servings_display': f"{recipe.servings} servings" if recipe.servings else "Servings not specified",
-                'time_display': self._format_recipe_times(recipe)
+                'view': view,
+                'time_display': view.times_display
             }
             
             # Render template
@@ -188,12 +764,11 @@ class RendererAgent(BaseAgent):
             
             # Save to file
             safe_title = self._make_safe_filename(recipe.title)
-            output_path = output_dir / "latex" / f"{safe_title}.tex"
+            output_path = self._output_file(output_dir, "latex", f"{safe_title}.tex")
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(latex_content)
+            file_size = self._write_output(output_path, latex_content)
             
-            return RenderResult(output_path, "latex", True)
+            return RenderResult(Path(output_path), "latex", True, file_size=file_size)
             
         except Exception as e:
             return RenderResult(None, "latex", False, str(e))
@@ -201,22 +776,14 @@ class RendererAgent(BaseAgent):
     def _render_json(self, recipe: Recipe, output_dir: Path) -> RenderResult:
         """Render recipe to JSON format."""
         try:
-            # Convert recipe to dictionary
-            recipe_dict = recipe.dict()
+            # Convert recipe to dictionary, skipping unwanted fields
+            recipe_dict = recipe.model_dump(exclude=JSON_EXCLUDED_FIELDS)
             
-            # Remove unwanted fields
-            unwanted_fields = [
-                'yield_amount', 'difficulty', 'cuisine', 'meal_type', 
-                'dietary_restrictions', 'source', 'equipment_needed'
-            ]
-            for field in unwanted_fields:
-                recipe_dict.pop(field, None)
-            
-            # Process ingredients to round weight quantities to integers
-            if 'ingredients' in recipe_dict:
-                for ingredient in recipe_dict['ingredients']:
-                    if ingredient.get('weight_quantity') is not None:
-                        ingredient['weight_quantity'] = int(round(ingredient['weight_quantity']))
+            # Process ingredients to round weight quantities to integers (half away from zero)
+            for ingredient in recipe_dict.get('ingredients', ()):
+                weight = ingredient.get('weight_quantity')
+                if weight is not None:
+                    ingredient['weight_quantity'] = int(weight + 0.5 if weight >= 0 else weight - 0.5)
             
             # Download and reference local image
             images_dir = output_dir / "image"
@@ -234,571 +801,264 @@ class RendererAgent(BaseAgent):
                     # Keep original URL if download fails
             
             # Add rendering metadata
-            recipe_dict['rendered_at'] = datetime.now().isoformat()
+            recipe_dict['rendered_at'] = self._rendered_at
             recipe_dict['format_version'] = "1.0"
             
-            # Ensure JSON directory exists
-            json_dir = output_dir / "json"
-            json_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Save to file
-            safe_title = self._make_safe_filename(recipe.title)
-            output_path = json_dir / f"{safe_title}.json"
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(recipe_dict, f, indent=2, ensure_ascii=False, default=str)
-            
-            return RenderResult(output_path, "json", True)
-            
-        except Exception as e:
-            return RenderResult(None, "json", False, str(e))
-    
-    def _render_strangetom(self, recipe: Recipe, output_dir: Path) -> RenderResult:
-        """Render recipe to strangetom-style HTML format."""
-        try:
-            # Load strangetom template
-            template = self.jinja_env.get_template("strangetom_recipe.html")
-            
-            # Add custom filter for quantity formatting
-            def format_quantity(value):
-                if value is None:
-                    return ""
-                if isinstance(value, (int, float)):
-                    if value == int(value):
-                        return str(int(value))
-                    # Handle fractions
-                    if value < 1:
-                        return self._decimal_to_fraction(value)
-                    elif value < 10:
-                        return f"{value:.2f}".rstrip('0').rstrip('.')
-                    else:
-                        return str(round(value, 1))
-                return str(value)
-            
-            self.jinja_env.filters['format_quantity'] = format_quantity
-            
-            # Prepare template context
-            context = {
-                'recipe': recipe,
-                'generated_date': datetime.now().strftime("%Y-%m-%d"),
-                'generated_datetime': datetime.now().strftime("%Y-%m-%d %H:%M"),
-                'prep_time_formatted': self._format_time(recipe.prep_time),
-                'cook_time_formatted': self._format_time(recipe.cook_time),
-                'total_time_formatted': self._format_time(recipe.total_time)
-            }
-            
-            # Render template
-            html_content = template.render(**context)
-            
-            # Save to file
+            # Save to file (JSON directory is created if missing)
             safe_title = self._make_safe_filename(recipe.title)
-            output_path = output_dir / "html" / f"{safe_title}-strangetom.html"
-            
-            # Ensure the html subdirectory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            return RenderResult(output_path, "strangetom", True)
-            
-        except Exception as e:
-            return RenderResult(None, "strangetom", False, str(e))
-    
-    def _render_interactive(self, recipe: Recipe, output_dir: Path) -> RenderResult:
-        """Render recipe to interactive HTML format with JavaScript features."""
-        try:
-            # Load interactive template
-            template = self.jinja_env.get_template("interactive_recipe.html")
-            
-            # Add custom filters for the interactive template
-            def replace_timers(text):
-                """Replace timer patterns with interactive timer buttons."""
-                import re
-                # Find patterns like "10 minutes", "5 mins", "1 hour", etc.
-                timer_pattern = r'(\d+)\s*(minute|minutes|min|mins|hour|hours|hr|hrs)(?:\s+(\w+))?'
-                
-                def make_timer_button(match):
-                    time_num = int(match.group(1))
-                    time_unit = match.group(2).lower()
-                    label = match.group(3) or "Timer"
-                    
-                    # Convert to minutes
-                    if time_unit in ['hour', 'hours', 'hr', 'hrs']:
-                        time_minutes = time_num * 60
-                    else:
-                        time_minutes = time_num
-                    
-                    return f'<button class="timer-button" data-minutes="{time_minutes}" data-label="{label}" title="Start {time_num} {time_unit} timer">{time_num} {time_unit}</button>'
-                
-                return re.sub(timer_pattern, make_timer_button, text)
-            
-            def add_ingredient_tooltips(text):
-                """Add tooltips for ingredients mentioned in instructions."""
-                # This would be more sophisticated in practice, matching ingredients
-                # to their quantities from the ingredients list
-                return text
-            
-            self.jinja_env.filters['replace_timers'] = replace_timers
-            self.jinja_env.filters['add_ingredient_tooltips'] = add_ingredient_tooltips
-            
-            # Process instructions with filters
-            processed_instructions = []
-            for instruction in recipe.instructions:
-                if hasattr(instruction, 'instruction'):
-                    instruction_text = instruction.instruction
-                else:
-                    instruction_text = str(instruction)
-                instruction_text = replace_timers(instruction_text)
-                instruction_text = add_ingredient_tooltips(instruction_text)
-                processed_instructions.append(instruction_text)
-            
-            # Prepare template context
-            context = {
-                'title': recipe.title,
-                'description': recipe.description,
-                'ingredients': recipe.ingredients,
-                'instructions': processed_instructions,
-                'servings': recipe.servings,
-                'prep_time': recipe.prep_time,
-                'cook_time': recipe.cook_time,
-                'total_time': recipe.total_time,
-                'difficulty': self._get_enum_display_value(recipe.difficulty) if recipe.difficulty else None,
-                'tags': self._extract_tags(recipe),
-                'generation_date': datetime.now().strftime("%Y-%m-%d %H:%M"),
-                'source_url': getattr(recipe, 'url', None)
-            }
-            
-            # Render template
-            html_content = template.render(**context)
-            
-            # Save to file
-            safe_title = self._make_safe_filename(recipe.title)
-            output_path = output_dir / "html" / f"{safe_title}-interactive.html"
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            return RenderResult(output_path, "interactive", True)
-            
-        except Exception as e:
-            return RenderResult(None, "interactive", False, str(e))
-    
-    def _render_cookbook(self, recipe: Recipe, output_dir: Path) -> RenderResult:
-        """Render recipe to cookbook-style LaTeX format (itakurah format)."""
-        try:
-            # Load cookbook template
-            template = self.jinja_env.get_template("cookbook_recipe.tex")
-            
-            # Format ingredients according to itakurah style
-            formatted_ingredients = []
-            for ingredient in recipe.ingredients:
-                parts = []
-                
-                # Quantity - use smart formatting
-                if ingredient.quantity is not None and ingredient.quantity > 0:
-                    qty = ingredient.quantity
-                    formatted_qty = self._format_quantity_for_display(qty)
-                    parts.append(formatted_qty)
-                
-                # Unit
-                if ingredient.unit:
-                    parts.append(ingredient.unit)
-                
-                # Name
-                parts.append(ingredient.name)
-                
-                # Preparation in parentheses
-                if ingredient.preparation:
-                    parts.append(f"({ingredient.preparation})")
-                
-                # Join with spaces and escape for LaTeX
-                ingredient_str = " ".join(parts)
-                formatted_ingredients.append(self._escape_latex(ingredient_str))
-            
-            # Format instructions according to itakurah style
-            formatted_instructions = []
-            for instruction in recipe.instructions:
-                if hasattr(instruction, 'instruction'):
-                    text = instruction.instruction
-                else:
-                    text = str(instruction)
-                formatted_instructions.append(self._escape_latex(text))
-            
-            # Prepare template variables
-            escaped_title = self._escape_latex(recipe.title)
-            
-            # Format servings display
-            servings_display = str(recipe.servings) if recipe.servings else "4"
+            output_path = self._output_file(output_dir, "json", f"{safe_title}.json", ensure_dir=True)
             
-            # Format time displays
-            prep_time_display = f"{recipe.prep_time} MIN" if recipe.prep_time else "15 MIN"
-            cook_time_display = f"{recipe.cook_time} MIN" if recipe.cook_time else "30 MIN"
+            json_content = json.dumps(recipe_dict, indent=2, ensure_ascii=False, default=str)
+            file_size = self._write_output(output_path, json_content)
+            
+            return RenderResult(Path(output_path), "json", True, file_size=file_size)
             
-            # Generate image path (following itakurah naming convention)
-            safe_name = recipe.title.lower()
-            safe_name = safe_name.replace(' ', '').replace(',', '').replace('&', 'and').replace("'", '')
-            safe_name = ''.join(c for c in safe_name if c.isalnum())
-            image_path = f"./images/{safe_name}.jpg"
+        except Exception as e:
+            return RenderResult(None, "json", False, str(e))
+    
+    def _render_strangetom(self, recipe: Recipe, output_dir: Path, view: Optional[RecipeView] = None) -> RenderResult:
+        """Render recipe to strangetom-style HTML format."""
+        try:
+            view = view or self._build_recipe_view(recipe)
             
             # Prepare template context
             context = {
-                'escaped_title': escaped_title,
-                'servings_display': servings_display,
-                'prep_time_display': prep_time_display,
-                'cook_time_display': cook_time_display,
-                'image_path': image_path,
-                'formatted_ingredients': formatted_ingredients,
-                'formatted_instructions': formatted_instructions
+                'recipe': recipe,
+                'generated_date': self._generated_date,
+                'generated_datetime': self._generated_datetime,
+                'view': view,
+                'prep_time_formatted': view.prep_time_display,
+                'cook_time_formatted': view.cook_time_display,
+                'total_time_formatted': view.total_time_display
             }
             
             # Render template
-            latex_content = template.render(**context)
-            
-            # Create cookbook directory structure
-            cookbook_dir = output_dir / "cookbook"
-            recipes_dir = cookbook_dir / "recipes"
-            images_dir = cookbook_dir / "images"
-            
-            recipes_dir.mkdir(parents=True, exist_ok=True)
-            images_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Generate or download placeholder image
-            image_filename = self._ensure_recipe_image(recipe, images_dir)
-            
-            # Update image path in context to match actual generated file
-            context['image_path'] = f"./images/{image_filename}"
-            
-            # Re-render template with updated image path
-            latex_content = template.render(**context)
+            html_content = self._get_template("strangetom_recipe.html").render(**context)
             
-            # Save recipe file to cookbook/recipes/
+            # Save to file
             safe_title = self._make_safe_filename(recipe.title)
-            output_path = recipes_dir / f"{safe_title}.tex"
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(latex_content)
+            # Ensure the html subdirectory exists
+            output_path = self._output_file(output_dir, "html", f"{safe_title}-strangetom.html", ensure_dir=True)
             
-            # Copy or create necessary cookbook files
-            self._setup_cookbook_files(cookbook_dir)
+            file_size = self._write_output(output_path, html_content)
             
-            return RenderResult(output_path, "cookbook", True)
+            return RenderResult(Path(output_path), "strangetom", True, file_size=file_size)
             
         except Exception as e:
-            return RenderResult(None, "cookbook", False, str(e))
+            return RenderResult(None, "strangetom", False, str(e))
     
-    def _create_default_templates(self):
-        """Create default templates if they don't exist."""
-        # HTML template (strangetom style)
-        html_template_path = self.templates_dir / "recipe_html.html"
-        if not html_template_path.exists():
-            self._create_html_template(html_template_path)
-        
-        # LaTeX template (cookbook style)
-        latex_template_path = self.templates_dir / "recipe_latex.tex"
-        if not latex_template_path.exists():
-            self._create_latex_template(latex_template_path)
+    def _format_quantity_filter(self, value) -> str:
+        """Jinja filter formatting a quantity for the strangetom template."""
+        if value is None:
+            return ""
+        if isinstance(value, (int, float)):
+            if value == int(value):
+                return str(int(value))
+            # Handle fractions
+            if value < 1:
+                return self._decimal_to_fraction(value)
+            elif value < 10:
+                return f"{value:.2f}".rstrip('0').rstrip('.')
+            else:
+                return str(round(value, 1))
+        return str(value)
     
-    def _create_html_template(self, template_path: Path):
-        """Create default HTML template inspired by strangetom style."""
-        html_template = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{{ recipe.title }}</title>
-    <style>
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f8f9fa;
-        }
-        .recipe-card {
-            background: white;
-            border-radius: 12px;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            overflow: hidden;
-            margin-bottom: 2rem;
-        }
-        .recipe-header {
-            padding: 2rem;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-        }
-        .recipe-title {
-            font-size: 2.5rem;
-            font-weight: 700;
-            margin: 0 0 0.5rem 0;
-        }
-        .recipe-description {
-            font-size: 1.1rem;
-            opacity: 0.9;
-            margin: 0;
-        }
-        .recipe-meta {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 1rem;
-            padding: 1.5rem 2rem;
-            background: #f8f9fa;
-            border-bottom: 1px solid #e9ecef;
-        }
-        .meta-item {
-            text-align: center;
-        }
-        .meta-label {
-            font-size: 0.875rem;
-            color: #6c757d;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            margin-bottom: 0.25rem;
-        }
-        .meta-value {
-            font-size: 1.25rem;
-            font-weight: 600;
-            color: #495057;
-        }
-        .recipe-content {
-            padding: 2rem;
-        }
-        .section {
-            margin-bottom: 2rem;
-        }
-        .section-title {
-            font-size: 1.5rem;
-            font-weight: 600;
-            color: #495057;
-            margin-bottom: 1rem;
-            padding-bottom: 0.5rem;
-            border-bottom: 2px solid #e9ecef;
-        }
-        .ingredients-list {
-            list-style: none;
-            padding: 0;
-        }
-        .ingredient-item {
-            padding: 0.75rem 0;
-            border-bottom: 1px solid #f8f9fa;
-            display: flex;
-            align-items: center;
-        }
-        .ingredient-item:last-child {
-            border-bottom: none;
-        }
-        .ingredient-quantity {
-            font-weight: 600;
-            color: #667eea;
-            min-width: 80px;
-            margin-right: 1rem;
-        }
-        .ingredient-name {
-            flex: 1;
-        }
-        .instructions-list {
-            counter-reset: step-counter;
-        }
-        .instruction-step {
-            counter-increment: step-counter;
-            margin-bottom: 1.5rem;
-            padding: 1rem;
-            background: #f8f9fa;
-            border-radius: 8px;
-            border-left: 4px solid #667eea;
-        }
-        .instruction-step::before {
-            content: counter(step-counter);
-            background: #667eea;
-            color: white;
-            width: 30px;
-            height: 30px;
-            border-radius: 50%;
-            display: inline-flex;
-            align-items: center;
-            justify-content: center;
-            font-weight: 600;
-            margin-right: 1rem;
-            float: left;
-        }
-        .instruction-text {
-            margin-left: 46px;
-        }
-        .tags {
-            display: flex;
-            flex-wrap: wrap;
-            gap: 0.5rem;
-            margin-top: 1rem;
-        }
-        .tag {
-            background: #e9ecef;
-            color: #495057;
-            padding: 0.25rem 0.75rem;
-            border-radius: 20px;
-            font-size: 0.875rem;
-        }
-        .footer {
-            text-align: center;
-            padding: 1rem;
-            color: #6c757d;
-            font-size: 0.875rem;
-            border-top: 1px solid #e9ecef;
-        }
-    </style>
-</head>
-<body>
-    <div class="recipe-card">
-        <div class="recipe-header">
-            <h1 class="recipe-title">{{ recipe.title }}</h1>
-            {% if recipe.description %}
-            <p class="recipe-description">{{ recipe.description }}</p>
-            {% endif %}
-        </div>
-        
-        <div class="recipe-meta">
-            {% if recipe.servings %}
-            <div class="meta-item">
-                <div class="meta-label">Servings</div>
-                <div class="meta-value">{{ recipe.servings }}</div>
-            </div>
-            {% endif %}
-            {% if prep_time_formatted %}
-            <div class="meta-item">
-                <div class="meta-label">Prep Time</div>
-                <div class="meta-value">{{ prep_time_formatted }}</div>
-            </div>
-            {% endif %}
-            {% if cook_time_formatted %}
-            <div class="meta-item">
-                <div class="meta-label">Cook Time</div>
-                <div class="meta-value">{{ cook_time_formatted }}</div>
-            </div>
-            {% endif %}
-            {% if total_time_formatted %}
-            <div class="meta-item">
-                <div class="meta-label">Total Time</div>
-                <div class="meta-value">{{ total_time_formatted }}</div>
-            </div>
-            {% endif %}
-            {% if recipe.difficulty %}
-            <div class="meta-item">
-                <div class="meta-label">Difficulty</div>
-                <div class="meta-value">{{ difficulty_display }}</div>
-            </div>
-            {% endif %}
-        </div>
+    def _replace_timers(self, text) -> Markup:
+        """Replace timer patterns with interactive timer buttons (escapes the surrounding text, returns Markup)."""
+        def make_timer_button(match):
+            time_num = int(match.group(1))
+            time_unit = match.group(2).lower()
+            label = match.group(3) or "Timer"
+            
+            # Convert to minutes
+            if time_unit in ['hour', 'hours', 'hr', 'hrs']:
+                time_minutes = time_num * 60
+            else:
+                time_minutes = time_num
+            
+            return f'<button class="timer-button" data-minutes="{time_minutes}" data-label="{label}" title="Start {time_num} {time_unit} timer">{time_num} {time_unit}</button>'
         
-        <div class="recipe-content">
-            {% if recipe.ingredients %}
-            <div class="section">
-                <h2 class="section-title">Ingredients</h2>
-                <ul class="ingredients-list">
-                    {% for ingredient in recipe.ingredients %}
-                    <li class="ingredient-item">
-                        <span class="ingredient-quantity">
-                            {% if ingredient.quantity %}{{ ingredient.quantity }}{% endif %}
-                            {% if ingredient.unit %} {{ ingredient.unit }}{% endif %}
-                        </span>
-                        <span class="ingredient-name">
-                            {{ ingredient.name }}
-                            {% if ingredient.preparation %}, {{ ingredient.preparation }}{% endif %}
-                        </span>
-                    </li>
-                    {% endfor %}
-                </ul>
-            </div>
-            {% endif %}
+        # Escape the scraped text first so only the generated buttons are markup; the timer
+        # pattern only spans digits and words, which escaping leaves untouched
+        return Markup(_TIMER_RE.sub(make_timer_button, str(escape(text))))
+    
+    def _add_ingredient_tooltips(self, text):
+        """Add tooltips for ingredients mentioned in instructions."""
+        # This would be more sophisticated in practice, matching ingredients
+        # to their quantities from the ingredients list
+        return text
+    
+    def _render_interactive(self, recipe: Recipe, output_dir: Path, view: Optional[RecipeView] = None) -> RenderResult:
+        """Render recipe to interactive HTML format with JavaScript features."""
+        try:
+            view = view or self._build_recipe_view(recipe)
             
-            {% if recipe.instructions %}
-            <div class="section">
-                <h2 class="section-title">Instructions</h2>
-                <div class="instructions-list">
-                    {% for instruction in recipe.instructions %}
-                    <div class="instruction-step">
-                        <div class="instruction-text">{{ instruction.instruction }}</div>
-                    </div>
-                    {% endfor %}
-                </div>
-            </div>
-            {% endif %}
+            # Process instructions with filters
+            processed_instructions = []
+            for instruction in recipe.instructions:
+                if hasattr(instruction, 'instruction'):
+                    instruction_text = instruction.instruction
+                else:
+                    instruction_text = str(instruction)
+                instruction_text = self._replace_timers(instruction_text)
+                instruction_text = self._add_ingredient_tooltips(instruction_text)
+                processed_instructions.append(instruction_text)
             
-            {% if recipe.tags %}
-            <div class="section">
-                <h2 class="section-title">Tags</h2>
-                <div class="tags">
-                    {% for tag in recipe.tags %}
-                    <span class="tag">{{ tag }}</span>
-                    {% endfor %}
-                </div>
-            </div>
-            {% endif %}
-        </div>
+            # Prepare template context
+            context = {
+                'title': recipe.title,
+                'description': recipe.description,
+                'ingredients': recipe.ingredients,
+                'instructions': processed_instructions,
+                'servings': recipe.servings,
+                'prep_time': recipe.prep_time,
+                'cook_time': recipe.cook_time,
+                'total_time': recipe.total_time,
+                'view': view,
+                'difficulty': view.difficulty_display if recipe.difficulty else None,
+                'tags': view.tags,
+                'generation_date': self._generated_datetime,
+                'source_url': getattr(recipe, 'url', None)
+            }
+            
+            # Render template
+            html_content = self._get_template("interactive_recipe.html").render(**context)
+            
+            # Save to file
+            safe_title = self._make_safe_filename(recipe.title)
+            output_path = self._output_file(output_dir, "html", f"{safe_title}-interactive.html")
+            
+            file_size = self._write_output(output_path, html_content)
+            
+            return RenderResult(Path(output_path), "interactive", True, file_size=file_size)
+            
+        except Exception as e:
+            return RenderResult(None, "interactive", False, str(e))
+    
+    def _render_cookbook(self, recipe: Recipe, output_dir: Path) -> RenderResult:
+        """Render recipe to cookbook-style LaTeX format (itakurah format)."""
+        try:
+            # Load cookbook template
+            template = self._get_template("cookbook_recipe.tex", latex=True)
+            
+            # Format ingredients according to itakurah style
+            formatted_ingredients = list(map(self._format_cookbook_ingredient, recipe.ingredients))
+            
+            # Format instructions according to itakurah style
+            formatted_instructions = [
+                self._escape_latex(getattr(instruction, 'instruction', None) or str(instruction))
+                for instruction in recipe.instructions
+            ]
+            
+            # Prepare template variables
+            escaped_title = self._escape_latex(recipe.title)
+            
+            # Format servings display
+            servings_display = str(recipe.servings) if recipe.servings else "4"
+            
+            # Format time displays
+            prep_time_display = f"{recipe.prep_time} MIN" if recipe.prep_time else "15 MIN"
+            cook_time_display = f"{recipe.cook_time} MIN" if recipe.cook_time else "30 MIN"
+            
+            # Prepare template context
+            context = {
+                'escaped_title': escaped_title,
+                'servings_display': servings_display,
+                'prep_time_display': prep_time_display,
+                'cook_time_display': cook_time_display,
+                'image_path': None,
+                'ingredients': recipe.ingredients,
+                'formatted_ingredients': formatted_ingredients,
+                'formatted_instructions': formatted_instructions
+            }
+            
+            # Create cookbook directory structure
+            cookbook_dir = output_dir / "cookbook"
+            recipes_dir = cookbook_dir / "recipes"
+            images_dir = cookbook_dir / "images"
+            
+            recipes_dir.mkdir(parents=True, exist_ok=True)
+            images_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Generate or download placeholder image
+            image_filename = self._ensure_recipe_image(recipe, images_dir)
+            
+            # Image path (itakurah naming convention) matches the actual generated file
+            context['image_path'] = f"./images/{image_filename}"
+            
+            # Render template
+            latex_content = template.render(**context)
+            
+            # Save recipe file to cookbook/recipes/
+            safe_title = self._make_safe_filename(recipe.title)
+            output_path = recipes_dir / f"{safe_title}.tex"
+            
+            file_size = self._write_output(output_path, latex_content)
+            
+            # Copy or create necessary cookbook files (render_multiple does this once for the batch)
+            if not self._in_batch:
+                self._setup_cookbook_files(cookbook_dir)
+            
+            return RenderResult(output_path, "cookbook", True, file_size=file_size)
+            
+        except Exception as e:
+            return RenderResult(None, "cookbook", False, str(e))
+    
+    def _get_template(self, template_name: str, latex: bool = False) -> Template:
+        """Get a compiled template, loading and compiling it only on first use."""
+        key = ('latex' if latex else 'html', template_name)
+        template = self._compiled_templates.get(key)
+        if template is None:
+            env = self.latex_env if latex else self.jinja_env
+            template = self._compiled_templates[key] = env.get_template(template_name)
+        return template
+    
+    def _create_default_templates(self):
+        """Create default templates if they don't exist (checked once per templates directory per process)."""
+        templates_key = str(self.templates_dir.resolve())
+        if templates_key in RendererAgent._default_templates_checked:
+            return
         
-        <div class="footer">
-            Generated on {{ generated_date }}
-            {% if recipe.source %} | Source: {{ recipe.source }}{% endif %}
-        </div>
-    </div>
-</body>
-</html>'''
+        with os.scandir(self.templates_dir) as entries:
+            existing = {entry.name for entry in entries}
+        
+        # HTML template (strangetom style)
+        if "recipe_html.html" not in existing:
+            self._create_html_template(self.templates_dir / "recipe_html.html")
+        
+        # LaTeX template (cookbook style)
+        if "recipe_latex.tex" not in existing:
+            self._create_latex_template(self.templates_dir / "recipe_latex.tex")
         
+        RendererAgent._default_templates_checked.add(templates_key)
+    
+    def _create_html_template(self, template_path: Path):
+        """Create default HTML template inspired by strangetom style."""
         with open(template_path, 'w', encoding='utf-8') as f:
-            f.write(html_template)
+            f.write(_DEFAULT_HTML_TEMPLATE)
     
     def _create_latex_template(self, template_path: Path):
         """Create default LaTeX template inspired by cookbook style."""
-        latex_template = r'''% Recipe: {{ recipe.title }}
-% Generated on {{ generated_date }}
-
-\begin{recipe}
-    [{{ escaped_title }}]
-    [{{ servings_display }}]
-    [{{ time_display }}]
-
-{% if recipe.description %}
-{{ escaped_description }}
-
-{% endif %}
-\begin{ingredients}
-{% for ingredient in escaped_ingredients %}
-    \ingredient{{{ ingredient }}}
-{% endfor %}
-\end{ingredients}
-
-\begin{steps}
-{% for instruction in escaped_instructions %}
-    \step {{ instruction }}
-{% endfor %}
-\end{steps}
-
-{% if recipe.tags %}
-\begin{center}
-\textit{Tags: {{ recipe.tags|join(', ') }}}
-\end{center}
-{% endif %}
-
-\end{recipe}
-'''
-        
         with open(template_path, 'w', encoding='utf-8') as f:
-            f.write(latex_template)
+            f.write(_DEFAULT_LATEX_TEMPLATE)
+    
+    def _build_recipe_view(self, recipe: Recipe) -> RecipeView:
+        """Compute the display-ready values for a recipe once."""
+        return RecipeView(
+            title=recipe.title,
+            description=recipe.description,
+            difficulty_display=self._get_enum_display_value(recipe.difficulty),
+            cuisine_display=self._get_enum_display_value(recipe.cuisine),
+            tags=self._extract_tags(recipe),
+            prep_time_display=self._format_time(recipe.prep_time),
+            cook_time_display=self._format_time(recipe.cook_time),
+            total_time_display=self._format_time(recipe.total_time),
+            times_display=self._format_recipe_times(recipe)
+        )
     
     def _format_time(self, minutes: Optional[int]) -> Optional[str]:
         """Format time in minutes to human readable string."""
-        if not minutes:
-            return None
-        
-        if minutes < 60:
-            return f"{minutes} min"
-        else:
-            hours = minutes // 60
-            mins = minutes % 60
-            if mins == 0:
-                return f"{hours} hr"
-            else:
-                return f"{hours} hr {mins} min"
+        return _format_time(minutes)
     
     def _format_recipe_times(self, recipe: Recipe) -> str:
         """Format recipe times for display."""
@@ -814,124 +1074,60 @@ class RendererAgent(BaseAgent):
     
     def _format_ingredient(self, ingredient) -> str:
         """Format ingredient for display."""
-        parts = []
-        if ingredient.quantity is not None:
-            parts.append(str(ingredient.quantity))
-        if ingredient.unit:
-            parts.append(ingredient.unit)
-        if ingredient.name:
-            parts.append(ingredient.name)
-        if ingredient.preparation:
-            parts.append(f"({ingredient.preparation})")
-        
-        return " ".join(parts)
+        quantity = f"{ingredient.quantity} " if ingredient.quantity is not None else ""
+        unit = f"{ingredient.unit} " if ingredient.unit else ""
+        preparation = f" ({ingredient.preparation})" if ingredient.preparation else ""
+        return f"{quantity}{unit}{ingredient.name or ''}{preparation}".strip()
+    
+    def _format_cookbook_ingredient(self, ingredient) -> str:
+        """Format and LaTeX-escape an ingredient in itakurah style (also the fmt_ingredient_latex filter)."""
+        # Quantity - use smart formatting
+        quantity = ingredient.quantity
+        quantity = f"{_format_quantity_for_display(quantity)} " if quantity is not None and quantity > 0 else ""
+        unit = f"{ingredient.unit} " if ingredient.unit else ""
+        # Preparation in parentheses
+        preparation = f" ({ingredient.preparation})" if ingredient.preparation else ""
+        return self._escape_latex(f"{quantity}{unit}{ingredient.name}{preparation}")
     
     def _get_enum_display_value(self, enum_field) -> str:
         """Get display value from enum field, handling both enum objects and strings."""
-        if not enum_field:
-            return 'Unknown'
-        
-        # If it's already a string (from serialization), use it directly
-        if isinstance(enum_field, str):
-            return enum_field.title()
-        
-        # If it's an enum object, get the value
-        if hasattr(enum_field, 'value'):
-            return enum_field.value.title()
-        
-        # Fallback to string representation
-        return str(enum_field).title()
+        return _enum_display_value(enum_field)
     
     def _make_safe_filename(self, title: str) -> str:
         """Create safe filename from recipe title."""
-        import re
+        cached = self._safe_name_cache.get(title)
+        if cached is not None:
+            return cached
+        
         # Remove or replace unsafe characters
-        safe = re.sub(r'[^\w\s-]', '', title).strip()
-        safe = re.sub(r'[-\s]+', '-', safe)
-        return safe.lower()[:50]  # Limit length
+        safe = _UNSAFE_FILENAME_RE.sub('', title).strip()
+        safe = _FILENAME_SEPARATOR_RE.sub('-', safe)
+        safe = safe.lower()[:50]  # Limit length
+        self._safe_name_cache[title] = safe
+        return safe
+    
+    def _make_image_basename(self, title: str) -> str:
+        """Create image basename from recipe title (itakurah naming: lowercase alphanumerics, '&' as 'and')."""
+        return title.lower().translate(_IMAGE_NAME_TABLE)
     
     def _escape_latex(self, text: str) -> str:
         """Escape special LaTeX characters."""
         if not text:
             return ""
+        if not _NEEDS_ESCAPE_RE.search(text):
+            return text
         
-        # First handle HTML entities that might be in the text
-        html_entities = {
-            '&amp;': '&',
-            '&lt;': '<',
-            '&gt;': '>',
-            '&quot;': '"',
-            '&#39;': "'",
-            '&####39;': "'",  # Sometimes appears as malformed entity
-            '&#x27;': "'",
-            '&apos;': "'",
-            '&nbsp;': ' ',
-            '&ndash;': '-',
-            '&mdash;': '--',
-            '&hellip;': '...'
-        }
-        
-        escaped = text
-        for entity, replacement in html_entities.items():
-            escaped = escaped.replace(entity, replacement)
-        
-        # Handle remaining numeric HTML entities with regex
-        import re
-        # Match &#number; patterns (like &#39; or &#x27;)
-        escaped = re.sub(r'&#(\d+);', lambda m: chr(int(m.group(1))), escaped)
-        escaped = re.sub(r'&#x([0-9a-fA-F]+);', lambda m: chr(int(m.group(1), 16)), escaped)
-        
-        # LaTeX special characters
-        latex_chars = {
-            '&': r'\&',
-            '%': r'\%',
-            '$': r'\$',
-            '#': r'\#',
-            '^': r'\textasciicircum{}',
-            '_': r'\_',
-            '{': r'\{',
-            '}': r'\}',
-            '~': r'\textasciitilde{}',
-            '\\': r'\textbackslash{}',
-        }
-        
-        for char, replacement in latex_chars.items():
-            escaped = escaped.replace(char, replacement)
-        
-        return escaped
+        # First handle HTML entities that might be in the text, then LaTeX special characters
+        escaped = _HTML_ENTITY_RE.sub(_replace_html_entity, text)
+        return escaped.translate(_LATEX_TRANSLATION)
     
     def _decimal_to_fraction(self, decimal: float) -> str:
         """Convert decimal to fraction string with cooking-friendly denominators."""
-        from fractions import Fraction
-        
-        # For very awkward fractions, round to nearest common cooking fraction
-        common_fractions = {
-            0.125: "1/8", 0.25: "1/4", 0.333: "1/3", 0.375: "3/8",
-            0.5: "1/2", 0.625: "5/8", 0.667: "2/3", 0.75: "3/4", 0.875: "7/8"
-        }
-        
-        # Find the closest common fraction
-        closest_decimal = min(common_fractions.keys(), key=lambda x: abs(x - decimal))
-        if abs(closest_decimal - decimal) < 0.05:  # Within 5% tolerance
-            return common_fractions[closest_decimal]
-        
-        # Otherwise use standard fraction conversion with reasonable limit
-        frac = Fraction(decimal).limit_denominator(16)
-        if frac.denominator == 1:
-            return str(frac.numerator)
-        
-        # If denominator is still awkward, round to decimal
-        if frac.denominator > 8:
-            return f"{decimal:.1f}".rstrip('0').rstrip('.')
-            
-        return f"{frac.numerator}/{frac.denominator}"
+        return _decimal_to_fraction(decimal)
     
     def _format_quantity_for_display(self, quantity: float) -> str:
         """Format quantity for HTML display with proper fractions."""
-        if quantity == int(quantity):
-            return str(int(quantity))
-        else:
-            return self._decimal_to_fraction(quantity)
+        return _format_quantity_for_display(quantity)
     
     def render_multiple(self, recipes: List[Recipe], format_type: str, output_dir: Optional[Path] = None) -> AgentResult[List[RenderResult]]:
         """Render multiple recipes to specified format."""
@@ -939,14 +1135,35 @@ class RendererAgent(BaseAgent):
             results = []
             failed_renders = []
             
-            for recipe in recipes:
-                result = self.render(recipe, format_type, output_dir)
-                if result.success:
-                    results.append(result.data)
-                else:
-                    failed_renders.append(recipe.title)
-                    self.logger.warning(f"Failed to render recipe: {recipe.title}")
+            self._refresh_timestamps()
+            
+            # Set up the shared cookbook files once, before the worker threads write recipes into it
+            cookbook_dir = (output_dir or self.output_dir) / "cookbook"
+            new_main_tex = False
+            if format_type.lower() == "cookbook":
+                cookbook_dir.mkdir(parents=True, exist_ok=True)
+                new_main_tex = not (cookbook_dir / "main.tex").exists()
+                self._setup_cookbook_files(cookbook_dir)
             
+            self._in_batch = True
+            try:
+                # Renders overlap on image downloads and file writes; map() keeps results in input order
+                with ThreadPoolExecutor(max_workers=max(1, min(32, len(recipes)))) as executor:
+                    render_results = executor.map(lambda recipe: self.render(recipe, format_type, output_dir), recipes)
+                    for recipe, result in zip(recipes, render_results):
+                        if result.success:
+                            results.append(result.data)
+                        else:
+                            failed_renders.append(recipe.title)
+                            self.logger.warning(f"Failed to render recipe: {recipe.title}")
+            finally:
+                self._in_batch = False
+            
+            # A main.tex created for this batch should list the recipes it rendered
+            if new_main_tex:
+                self._create_main_tex(cookbook_dir / "main.tex", cookbook_dir)
+            
+            self.logger.info(f"**RENDERING** - Rendered {len(results)} of {len(recipes)} recipes to {format_type}")
             return AgentResult(
                 success=True,
                 data=results,
@@ -1025,35 +1242,77 @@ class RendererAgent(BaseAgent):
         if hasattr(recipe, 'dietary_tags') and recipe.dietary_tags:
             tags.extend([tag.lower() for tag in recipe.dietary_tags])
         
-        return list(set(tags))  # Remove duplicates
+        if not tags:
+            return []
+        return list(dict.fromkeys(tags))  # Remove duplicates, keeping first-seen order
+    
+    def _get_http_session(self):
+        """Get the pooled HTTP session used for image downloads (keep-alive across recipes)."""
+        if self._http_session is not None:
+            return self._http_session
+        
+        with self._lazy_init_lock:
+            if self._http_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                
+                session = requests.Session()
+                # Sized for render_multiple's worker threads
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({'User-Agent': self.settings.scraping.user_agent})
+                self._http_session = session
+            return self._http_session
     
     def _ensure_recipe_image(self, recipe: Recipe, images_dir: Path) -> str:
+        """Ensure recipe has an image, reusing the result of earlier renders of the same recipe."""
+        cache_key = (recipe.title, recipe.image_url, str(images_dir))
+        cached = self._image_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        image_filename = self._fetch_recipe_image(recipe, images_dir)
+        self._image_cache[cache_key] = image_filename
+        return image_filename
+    
+    def _get_image_manifest(self, images_dir: Path) -> set:
+        """Names of the files in an images directory, listed on first use and kept up to date as images are written."""
+        key = str(images_dir)
+        manifest = self._image_manifests.get(key)
+        if manifest is None:
+            try:
+                manifest = set(os.listdir(images_dir))
+            except FileNotFoundError:
+                manifest = set()
+            self._image_manifests[key] = manifest
+        return manifest
+    
+    def _fetch_recipe_image(self, recipe: Recipe, images_dir: Path) -> str:
         """Ensure recipe has an image, generate placeholder if needed."""
         # Generate safe filename for image
-        safe_name = recipe.title.lower()
-        safe_name = safe_name.replace(' ', '').replace(',', '').replace('&', 'and').replace("'", '')
-        safe_name = ''.join(c for c in safe_name if c.isalnum())
-        image_filename = f"{safe_name}.jpg"
+        image_filename = f"{self._make_image_basename(recipe.title)}.jpg"
         image_path = images_dir / image_filename
+        manifest = self._get_image_manifest(images_dir)
         
         # If image already exists, use it
-        if image_path.exists():
+        if image_filename in manifest:
             return image_filename
         
         # Try to download from recipe URL if available
         if recipe.image_url:
             try:
-                import requests
                 from PIL import Image
                 import io
                 
-                response = requests.get(recipe.image_url, timeout=10)
+                response = self._get_http_session().get(recipe.image_url, timeout=10)
                 response.raise_for_status()
                 
                 # Convert to PIL Image and save as JPEG
                 img = Image.open(io.BytesIO(response.content))
                 img = img.convert('RGB')  # Ensure RGB for JPEG
                 img.save(image_path, 'JPEG', quality=85)
+                manifest.add(image_filename)
                 
                 self.logger.info(f"Downloaded recipe image: {image_filename}")
                 return image_filename
@@ -1061,8 +1320,11 @@ class RendererAgent(BaseAgent):
             except Exception as e:
                 self.logger.warning(f"Failed to download image from {recipe.image_url}: {e}")
         
-        # Generate placeholder image
-        return self._generate_placeholder_image(recipe, images_dir, image_filename)
+        # Generate placeholder image (which returns the filename even when it could not write one)
+        result = self._generate_placeholder_image(recipe, images_dir, image_filename)
+        if image_path.exists():
+            manifest.add(image_filename)
+        return result
     
     def _generate_placeholder_image(self, recipe: Recipe, images_dir: Path, filename: str) -> str:
         """Generate a placeholder image for the recipe. Prioritize local generation over unreliable external services."""
@@ -1076,35 +1338,13 @@ class RendererAgent(BaseAgent):
         
         # If local generation failed, try external sources as backup
         try:
-            import requests
-            from urllib.parse import quote
-            
-            # Extract main food item from recipe for search
+            # Extract main food item from recipe for search (only needed on this fallback path)
             food_keywords = self._extract_food_keywords(recipe)
-            search_query = f"{food_keywords} food dish"
-            
-            # Try different food-specific image sources with multiple search strategies
-            # Encode search terms properly for URLs
-            encoded_keywords = quote(food_keywords.encode('utf-8'))
-            encoded_query = quote(search_query.encode('utf-8'))
-            encoded_title = quote(' '.join(recipe.title.split()[:2]).encode('utf-8'))
-            
-            image_sources = [
-                # Unsplash with specific food queries
-                f"https://source.unsplash.com/600x400/?{encoded_keywords}",
-                f"https://source.unsplash.com/600x400/?{encoded_query}",
-                f"https://source.unsplash.com/600x400/?food,{encoded_keywords}",
-                # Lorem Flickr with food focus
-                f"https://loremflickr.com/600/400/{encoded_keywords},food",
-                f"https://loremflickr.com/600/400/{encoded_query}",
-                # Fallback to recipe title
-                f"https://source.unsplash.com/600x400/?{encoded_title}",
-            ]
             
-            for source_url in image_sources:
+            for source_url in self._iter_external_sources(recipe, food_keywords):
                 try:
                     self.logger.info(f"Trying external image source with keywords '{food_keywords}' from {source_url}")
-                    response = requests.get(source_url, timeout=5, stream=True)  # Reduced timeout
+                    response = self._get_http_session().get(source_url, timeout=5, stream=True)  # Reduced timeout
                     response.raise_for_status()
                     
                     # Check if we got an actual image (not an error page)
@@ -1131,40 +1371,37 @@ class RendererAgent(BaseAgent):
         # Return the local result (even if it was a txt fallback)
         return local_result
     
-    def _extract_food_keywords(self, recipe: Recipe) -> str:
-        """Extract main food keywords from recipe for image search."""
-        import re
+    def _iter_external_sources(self, recipe: Recipe, food_keywords: str):
+        """Yield external placeholder image URLs, encoding each search term only when it is reached."""
+        from urllib.parse import quote
         
-        # Remove common recipe words and keep main food items
-        common_words = {
-            'recipe', 'easy', 'best', 'homemade', 'simple', 'quick', 'perfect',
-            'delicious', 'amazing', 'ultimate', 'classic', 'traditional', 'authentic',
-            'healthy', 'low', 'fat', 'gluten', 'free', 'vegan', 'vegetarian',
-            'how', 'to', 'make', 'bake', 'cook', 'prepare', 'with', 'and', 'or',
-            'the', 'a', 'an', 'for', 'in', 'on', 'of', 'style', 'minute', 'hour',
-            'from', 'using', 'scratch', 'step', 'by', 'home', 'made'
-        }
-        
-        # Food-specific keywords to prioritize
-        food_categories = {
-            'proteins': ['chicken', 'beef', 'pork', 'fish', 'salmon', 'tuna', 'turkey', 'lamb', 'shrimp', 'crab', 'eggs'],
-            'vegetables': ['tomato', 'potato', 'onion', 'carrot', 'broccoli', 'spinach', 'mushroom', 'pepper', 'eggplant'],
-            'grains': ['pasta', 'rice', 'bread', 'noodles', 'quinoa', 'oats', 'flour'],
-            'dairy': ['cheese', 'milk', 'butter', 'cream', 'yogurt'],
-            'desserts': ['cake', 'cookie', 'pie', 'chocolate', 'vanilla', 'strawberry', 'banana', 'apple'],
-            'dishes': ['soup', 'salad', 'sandwich', 'pizza', 'burger', 'taco', 'curry', 'stir-fry', 'pancakes']
-        }
+        search_query = f"{food_keywords} food dish"
         
+        # Unsplash with specific food queries
+        encoded_keywords = quote(food_keywords.encode('utf-8'))
+        yield f"https://source.unsplash.com/600x400/?{encoded_keywords}"
+        encoded_query = quote(search_query.encode('utf-8'))
+        yield f"https://source.unsplash.com/600x400/?{encoded_query}"
+        yield f"https://source.unsplash.com/600x400/?food,{encoded_keywords}"
+        # Lorem Flickr with food focus
+        yield f"https://loremflickr.com/600/400/{encoded_keywords},food"
+        yield f"https://loremflickr.com/600/400/{encoded_query}"
+        # Fallback to recipe title
+        encoded_title = quote(' '.join(recipe.title.split()[:2]).encode('utf-8'))
+        yield f"https://source.unsplash.com/600x400/?{encoded_title}"
+    
+    def _extract_food_keywords(self, recipe: Recipe) -> str:
+        """Extract main food keywords from recipe for image search."""
         # Extract words from title
-        title_words = re.findall(r'\b\w+\b', recipe.title.lower())
-        title_keywords = [word for word in title_words if word not in common_words and len(word) > 2]
+        title_words = _WORD_RE.findall(recipe.title.lower())
+        title_keywords = [word for word in title_words if word not in _COMMON_TITLE_WORDS and len(word) > 2]
         
         # Extract main ingredients (first 3)
         ingredient_keywords = []
         if recipe.ingredients:
             for ingredient in recipe.ingredients[:3]:
-                name_words = re.findall(r'\b\w+\b', ingredient.name.lower())
-                ingredient_keywords.extend([word for word in name_words if word not in common_words and len(word) > 2])
+                name_words = _WORD_RE.findall(ingredient.name.lower())
+                ingredient_keywords.extend([word for word in name_words if word not in _COMMON_TITLE_WORDS and len(word) > 2])
         
         # Combine and prioritize keywords
         all_keywords = title_keywords + ingredient_keywords[:3]  # Limit to avoid too many keywords
@@ -1172,10 +1409,8 @@ class RendererAgent(BaseAgent):
         # Prioritize food category words
         prioritized_keywords = []
         for keyword in all_keywords:
-            for category, words in food_categories.items():
-                if keyword in words:
-                    prioritized_keywords.insert(0, keyword)  # Add to front
-                    break
+            if keyword in _FOOD_WORDS:
+                prioritized_keywords.insert(0, keyword)  # Add to front
             else:
                 prioritized_keywords.append(keyword)
         
@@ -1190,53 +1425,102 @@ class RendererAgent(BaseAgent):
         
         return ' '.join(final_keywords) if final_keywords else recipe.title.split()[0]
     
+    def _load_fonts(self) -> tuple:
+        """Load the (large, small) placeholder fonts on first use and cache them on the renderer."""
+        if self._fonts is not None:
+            return self._fonts
+        
+        with self._lazy_init_lock:
+            if self._fonts is None:
+                self._fonts = self._find_fonts()
+            return self._fonts
+    
+    def _find_fonts(self) -> tuple:
+        """Load the (large, small) placeholder fonts, falling back to PIL's default font."""
+        from PIL import ImageFont
+        
+        # Try to load fonts with multiple fallback options
+        font_large = None
+        font_small = None
+        
+        # Try different font paths for better compatibility
+        font_paths = [
+            "Arial.ttf",  # Windows
+            "/System/Library/Fonts/Arial.ttf",  # macOS
+            "/System/Library/Fonts/Helvetica.ttc",  # macOS alternative
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
+            "/usr/share/fonts/TTF/arial.ttf",  # Some Linux distros
+        ]
+        
+        for font_path in font_paths:
+            try:
+                font_large = ImageFont.truetype(font_path, 36)
+                font_small = ImageFont.truetype(font_path, 20)
+                break
+            except:
+                continue
+        
+        # Final fallback to default font
+        if not font_large:
+            font_large = ImageFont.load_default()
+            font_small = ImageFont.load_default()
+        
+        return font_large, font_small
+    
+    def _get_placeholder_base(self):
+        """Build the title-independent placeholder background (gradient and border) once per renderer."""
+        if self._placeholder_base is not None:
+            return self._placeholder_base
+        
+        with self._lazy_init_lock:
+            if self._placeholder_base is None:
+                from PIL import Image, ImageDraw
+                
+                # Create a 600x400 image with a nice gradient background
+                width, height = 600, 400
+                
+                # Create gradient background: one grey column stretched across the width
+                column = bytes(int(245 - (y / height) * 30) for y in range(height))  # Subtle gradient
+                img = Image.frombytes('L', (1, height), column).resize((width, height), Image.NEAREST).convert('RGB')
+                
+                # Add decorative border
+                border_color = '#cccccc'
+                ImageDraw.Draw(img).rectangle([10, 10, width-10, height-10], outline=border_color, width=3)
+                self._placeholder_base = img
+            return self._placeholder_base
+    
+    def _placeholder_cache_path(self, title: str) -> Path:
+        """Path of the cached placeholder image for a title, shared by all output directories."""
+        digest = hashlib.blake2b(title.encode('utf-8'), digest_size=8).hexdigest()
+        return self.output_dir / ".cache" / "placeholders" / f"{digest}.jpg"
+    
     def _generate_local_placeholder_image(self, recipe: Recipe, images_dir: Path, filename: str) -> str:
         """Generate a local placeholder image for the recipe."""
         try:
-            from PIL import Image, ImageDraw, ImageFont
+            from PIL import ImageDraw
             import textwrap
             
             # Ensure images directory exists
             images_dir.mkdir(parents=True, exist_ok=True)
+            image_path = images_dir / filename
             
-            # Create a 600x400 image with a nice gradient background
-            width, height = 600, 400
-            img = Image.new('RGB', (width, height), '#f5f5f5')
-            draw = ImageDraw.Draw(img)
-            
-            # Create gradient background
-            for y in range(height):
-                color_value = int(245 - (y / height) * 30)  # Subtle gradient
-                draw.line([(0, y), (width, y)], fill=(color_value, color_value, color_value))
-            
-            # Try to load fonts with multiple fallback options
-            font_large = None
-            font_small = None
-            
-            # Try different font paths for better compatibility
-            font_paths = [
-                "Arial.ttf",  # Windows
-                "/System/Library/Fonts/Arial.ttf",  # macOS
-                "/System/Library/Fonts/Helvetica.ttc",  # macOS alternative
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
-                "/usr/share/fonts/TTF/arial.ttf",  # Some Linux distros
-            ]
+            # Placeholders only depend on the title, so reuse one generated for another output directory
+            title = recipe.title if recipe.title else "Recipe"
+            cache_path = self._placeholder_cache_path(title)
+            if cache_path.exists():
+                shutil.copyfile(cache_path, image_path)
+                self.logger.info(f"Reused cached placeholder image: {filename}")
+                return filename
             
-            for font_path in font_paths:
-                try:
-                    font_large = ImageFont.truetype(font_path, 36)
-                    font_small = ImageFont.truetype(font_path, 20)
-                    break
-                except:
-                    continue
+            # Start from a copy of the shared gradient-and-border background; only the text is per recipe
+            img = self._get_placeholder_base().copy()
+            width, height = img.size
+            draw = ImageDraw.Draw(img)
             
-            # Final fallback to default font
-            if not font_large:
-                font_large = ImageFont.load_default()
-                font_small = ImageFont.load_default()
+            # Fonts are loaded once and reused for every placeholder
+            font_large, font_small = self._load_fonts()
             
             # Add recipe title (wrapped)
-            title = recipe.title if recipe.title else "Recipe"
             wrapped_title = textwrap.fill(title, width=20)  # Wrap long titles
             
             # Calculate text size and position
@@ -1272,17 +1556,14 @@ class RendererAgent(BaseAgent):
             
             draw.text((subtitle_x, subtitle_y), subtitle, fill='#666666', font=font_small)
             
-            # Add decorative border
-            border_color = '#cccccc'
-            draw.rectangle([10, 10, width-10, height-10], outline=border_color, width=3)
-            
             # Save image with proper error handling
-            image_path = images_dir / filename
             img.save(image_path, 'JPEG', quality=85)
             
             # Verify the file was created and has reasonable size
             if image_path.exists() and image_path.stat().st_size > 1000:
                 self.logger.info(f"Generated local placeholder image: {filename} ({image_path.stat().st_size} bytes)")
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(image_path, cache_path)
                 return filename
             else:
                 raise Exception("Generated image file is too small or doesn't exist")
@@ -1326,52 +1607,83 @@ class RendererAgent(BaseAgent):
         except Exception as e:
             self.logger.warning(f"Failed to setup cookbook files: {e}")
     
+    def _get_itakurah_checkout(self) -> Optional[Path]:
+        """Return the cached itakurah/LaTeX-Cookbook checkout, cloning or refreshing it when missing or stale."""
+        import subprocess
+        import tempfile
+        
+        repo_path = _ITAKURAH_CACHE_DIR
+        # Serialize threads from render_multiple so only one of them touches the checkout;
+        # other processes (batch convert workers) are handled by cloning aside and renaming
+        with _ITAKURAH_LOCK:
+            if (repo_path / ".git").exists():
+                if time.time() - repo_path.stat().st_mtime < _ITAKURAH_MAX_AGE:
+                    return repo_path
+                
+                self.logger.info("Refreshing cached itakurah/LaTeX-Cookbook files...")
+                result = subprocess.run(
+                    ["git", "-C", str(repo_path), "pull", "--ff-only", "--depth=1"],
+                    capture_output=True, text=True
+                )
+                if result.returncode != 0:
+                    # A stale checkout is still usable (e.g. offline)
+                    self.logger.warning("Failed to refresh itakurah repository, using cached copy")
+                os.utime(repo_path)
+                return repo_path
+            
+            self.logger.info("Downloading itakurah/LaTeX-Cookbook files...")
+            repo_path.parent.mkdir(parents=True, exist_ok=True)
+            clone_path = Path(tempfile.mkdtemp(prefix=".clone-", dir=repo_path.parent))
+            result = subprocess.run(
+                ["git", "clone", "--depth=1", _ITAKURAH_REPO_URL, str(clone_path)],
+                capture_output=True, text=True
+            )
+            
+            if result.returncode != 0:
+                self.logger.warning("Failed to clone itakurah repository")
+                shutil.rmtree(clone_path, ignore_errors=True)
+                return None
+            
+            # Drop a leftover partial checkout, then publish ours; if another process got
+            # there first, keep theirs
+            if repo_path.exists() and not (repo_path / ".git").exists():
+                shutil.rmtree(repo_path, ignore_errors=True)
+            try:
+                os.rename(clone_path, repo_path)
+            except OSError:
+                shutil.rmtree(clone_path, ignore_errors=True)
+            return repo_path
+    
     def _copy_itakurah_files(self, cookbook_dir: Path):
         """Copy necessary files from itakurah repository if available."""
         try:
-            import tempfile
-            import subprocess
-            import shutil
-            
-            # Clone itakurah repo to temporary directory
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                repo_path = temp_path / "LaTeX-Cookbook"
-                
-                self.logger.info("Downloading itakurah/LaTeX-Cookbook files...")
-                result = subprocess.run([
-                    "git", "clone", 
-                    "https://github.com/itakurah/LaTeX-Cookbook.git",
-                    str(repo_path)
-                ], capture_output=True, text=True)
-                
-                if result.returncode != 0:
-                    self.logger.warning("Failed to clone itakurah repository")
-                    return
-                
-                # Copy essential files
-                files_to_copy = [
-                    "recipebook.cls",
-                    "recipebook.cfg", 
-                    "recipebook-lang.sty",
-                    "titlepage.tex"
-                ]
-                
-                for file_name in files_to_copy:
-                    src = repo_path / file_name
-                    dst = cookbook_dir / file_name
-                    if src.exists():
-                        shutil.copy2(src, dst)
-                        self.logger.debug(f"Copied {file_name}")
-                
-                # Copy fonts directory
-                fonts_src = repo_path / "fonts"
-                fonts_dst = cookbook_dir / "fonts"
-                if fonts_src.exists():
-                    shutil.copytree(fonts_src, fonts_dst, dirs_exist_ok=True)
-                    self.logger.debug("Copied fonts directory")
-                
-                self.logger.info("Successfully copied itakurah LaTeX-Cookbook files")
+            repo_path = self._get_itakurah_checkout()
+            if repo_path is None:
+                return
+            
+            # Copy essential files
+            files_to_copy = [
+                "recipebook.cls",
+                "recipebook.cfg", 
+                "recipebook-lang.sty",
+                "titlepage.tex"
+            ]
+            
+            for file_name in files_to_copy:
+                src = repo_path / file_name
+                dst = cookbook_dir / file_name
+                if src.exists():
+                    shutil.copy2(src, dst)
+                    self.logger.debug(f"Copied {file_name}")
+            
+            # Copy fonts directory
+            fonts_src = repo_path / "fonts"
+            fonts_dst = cookbook_dir / "fonts"
+            if fonts_src.exists():
+                shutil.copytree(fonts_src, fonts_dst, dirs_exist_ok=True)
+                self.logger.debug("Copied fonts directory")
+            
+            self.logger.info("Successfully copied itakurah LaTeX-Cookbook files")
                 
         except Exception as e:
             self.logger.warning(f"Failed to copy itakurah files: {e}")
@@ -1388,19 +1700,17 @@ class RendererAgent(BaseAgent):
             for tex_file in recipes_dir.glob("*.tex"):
                 recipe_files.append(tex_file.stem)
         
+        # Input statements for each recipe, joined once rather than concatenated in a loop
+        recipe_inputs = "".join(f"\\input{{recipes/{recipe_file}}}\n" for recipe_file in sorted(recipe_files))
+        
         main_content = f"""\\documentclass{{recipebook}}
 
 \\begin{{document}}
 \\input{{titlepage}}
 \\customtableofcontents
+{recipe_inputs}\\end{{document}}
 """
         
-        # Add input statements for each recipe
-        for recipe_file in sorted(recipe_files):
-            main_content += f"\\input{{recipes/{recipe_file}}}\n"
-        
-        main_content += "\\end{document}\n"
-        
         with open(main_tex_path, 'w', encoding='utf-8') as f:
             f.write(main_content)
         
@@ -2,16 +2,30 @@
 """
 Recipe Agent System - Main Entry Point
 """
+from __future__ import annotations
+
 import typer
 from rich.console import Console
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 
-from .orchestrators.orchestrator_langgraph import LangGraphRecipeOrchestrator
+import logging
+import os
+import shutil
+import subprocess
 import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))
-from config.settings import Settings
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
+
+if TYPE_CHECKING:
+    # pydantic-settings is slow to import; commands load it when they need settings
+    from config.settings import Settings
 
 app = typer.Typer(
     name="recipes-agent",
@@ -20,6 +34,37 @@ app = typer.Typer(
 )
 console = Console()
 
+# Output formats accepted by convert, mapped to the renderer formats that produce them
+_FORMAT_MAPPING = {
+    "latex": "cookbook",  # latex output uses cookbook format
+    "html": "strangetom"  # html output uses strangetom format
+}
+
+def _validate_dirs(*dirs: Tuple[str, Path]) -> bool:
+    """Check that each (label, path) pair names an existing directory, reporting the first that doesn't."""
+    for label, path in dirs:
+        if not path.is_dir():  # One stat; False for missing paths too
+            console.print(f"[bold red]✗ {label} directory not found:[/bold red] {path}")
+            return False
+    return True
+
+def _print_progress(done: int, total: int, name: str) -> None:
+    """Print a batch progress line; plain print when not on a terminal, skipping rich's markup rendering."""
+    if console.is_terminal:
+        console.print(f"[cyan]{done}/{total}[/cyan] {name}")
+    else:
+        print(f"{done}/{total} {name}")
+
+@lru_cache(maxsize=1)
+def _find_xelatex() -> Optional[str]:
+    """Locate the xelatex executable on PATH once per process."""
+    return shutil.which("xelatex")
+
+def _list_files(directory: Path, suffix: Union[str, Tuple[str, ...]]) -> List[Path]:
+    """List the files in directory whose names end with suffix, in one scandir pass without glob matching."""
+    with os.scandir(directory) as entries:
+        return [Path(entry.path) for entry in entries if entry.name.endswith(suffix) and entry.is_file()]
+
 @app.command()
 def process(
     url: Optional[str] = typer.Argument(None, help="Recipe URL to process"),
@@ -54,6 +99,7 @@ def process(
         return 1
     
     # Load configuration
+    from config.settings import Settings
     settings = Settings.load(config_file)
     
     # Determine processing mode
@@ -76,6 +122,9 @@ def _process_single(url: str, output_format: str, output_dir: Optional[Path], se
         if debug:
             console.print(f"[bold blue]Debug output:[/bold blue] {debug_dir}")
     
+    # Import here so commands that never scrape don't load the whole agent graph
+    from .orchestrators.orchestrator_langgraph import LangGraphRecipeOrchestrator
+
     # Initialize LangGraph orchestrator
     orchestrator = LangGraphRecipeOrchestrator(settings)
     
@@ -99,51 +148,71 @@ def _process_single(url: str, output_format: str, output_dir: Optional[Path], se
             console.print_exception()
         return 1
 
+def _iter_batch_urls(file_path: Path) -> Iterator[str]:
+    """Yield the URLs in a batch file, skipping blank lines and # comments."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            url = line.strip()
+            if url and url[0] != '#':
+                yield url
+
 def _process_batch(file_path: Path, output_format: str, output_dir: Optional[Path], settings: Settings, verbose: bool, debug: bool, debug_dir: str) -> int:
     """Process multiple recipe URLs from a text file."""
     try:
-        # Read URLs from file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            urls = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+        # Count URLs for progress; they are read again lazily as they are submitted
+        total = sum(1 for _ in _iter_batch_urls(file_path))
         
-        if not urls:
+        if not total:
             console.print(f"[bold red]✗ No URLs found in file:[/bold red] {file_path}")
             return 1
         
-        console.print(f"[bold blue]Batch processing {len(urls)} URLs from:[/bold blue] {file_path}")
+        console.print(f"[bold blue]Batch processing {total} URLs from:[/bold blue] {file_path}")
         console.print(f"[bold blue]Output format:[/bold blue] {output_format}")
         
-        # Initialize orchestrator
-        orchestrator = LangGraphRecipeOrchestrator(settings)
+        # Each worker thread gets its own orchestrator: the agents keep per-instance caches and
+        # template state that are not safe to share across threads
+        from .orchestrators.orchestrator_langgraph import LangGraphRecipeOrchestrator
+        local = threading.local()
+        
+        def process_url(url: str):
+            orchestrator = getattr(local, 'orchestrator', None)
+            if orchestrator is None:
+                orchestrator = local.orchestrator = LangGraphRecipeOrchestrator(settings)
+            return orchestrator.process_recipe(url, output_format, output_dir, debug, debug_dir)
         
         # Track results
         successful = 0
         failed = 0
         failed_urls = []
         
-        # Process each URL
-        for i, url in enumerate(urls, 1):
-            if verbose:
-                console.print(f"\n[bold cyan]Processing {i}/{len(urls)}:[/bold cyan] {url}")
-            else:
-                console.print(f"[cyan]{i}/{len(urls)}[/cyan] {url[:60]}{'...' if len(url) > 60 else ''}")
+        # Scraping and LLM calls are network-bound, so overlap them across URLs
+        max_workers = max(1, min(settings.processing.batch_concurrency, total))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(process_url, url): url for url in _iter_batch_urls(file_path)}
             
-            try:
-                result = orchestrator.process_recipe(url, output_format, output_dir, debug, debug_dir)
-                
-                if result.success:
-                    successful += 1
-                    if verbose:
-                        console.print(f"[green]✓ Success:[/green] {result.output_path}")
+            for i, future in enumerate(as_completed(futures), 1):
+                url = futures[future]
+                if verbose:
+                    console.print(f"\n[bold cyan]Processed {i}/{total}:[/bold cyan] {url}")
                 else:
-                    failed += 1
-                    failed_urls.append((url, result.error))
-                    console.print(f"[red]✗ Failed:[/red] {result.error}")
+                    _print_progress(i, total, f"{url[:60]}{'...' if len(url) > 60 else ''}")
+                
+                try:
+                    result = future.result()
                     
-            except Exception as e:
-                failed += 1
-                failed_urls.append((url, str(e)))
-                console.print(f"[red]✗ Error:[/red] {str(e)}")
+                    if result.success:
+                        successful += 1
+                        if verbose:
+                            console.print(f"[green]✓ Success:[/green] {result.output_path}")
+                    else:
+                        failed += 1
+                        failed_urls.append((url, result.error))
+                        console.print(f"[red]✗ Failed:[/red] {result.error}")
+                        
+                except Exception as e:
+                    failed += 1
+                    failed_urls.append((url, str(e)))
+                    console.print(f"[red]✗ Error:[/red] {str(e)}")
         
         # Summary
         console.print(f"\n[bold]Batch processing complete![/bold]")
@@ -185,6 +254,7 @@ def convert(
         return 1
     
     # Load configuration
+    from config.settings import Settings
     settings = Settings.load(config_file)
     
     # Check if input is directory for batch conversion
@@ -233,11 +303,7 @@ def _convert_single(json_file: Path, output_file: Path, settings: Settings, verb
         renderer = RendererAgent(settings)
         
         # Map format names to internal renderer formats
-        format_mapping = {
-            "latex": "cookbook",  # latex output uses cookbook format
-            "html": "strangetom"  # html output uses strangetom format
-        }
-        renderer_format = format_mapping.get(output_format.lower(), output_format)
+        renderer_format = _FORMAT_MAPPING.get(output_format.lower(), output_format)
         
         # Create output directory if it doesn't exist
         output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -247,7 +313,6 @@ def _convert_single(json_file: Path, output_file: Path, settings: Settings, verb
         
         # Move the generated file to the specific output path if needed
         if result.success and result.data.output_path != output_file:
-            import shutil
             shutil.move(str(result.data.output_path), str(output_file))
             # Update the result path
             result.data.output_path = output_file
@@ -265,6 +330,28 @@ def _convert_single(json_file: Path, output_file: Path, settings: Settings, verb
             console.print_exception()
         return 1
 
+# Renderer and staging directory owned by a batch-convert worker (see _init_convert_worker)
+_convert_renderer = None
+_convert_staging_dir = None
+
+def _init_convert_worker(settings: Settings, staging_root: str) -> None:
+    """Create the renderer and staging directory a batch-convert worker reuses for all of its files."""
+    global _convert_renderer, _convert_staging_dir
+    from .agents.renderer import RendererAgent
+    _convert_renderer = RendererAgent(settings)
+    _convert_staging_dir = Path(tempfile.mkdtemp(dir=staging_root))
+
+def _convert_json_file(json_file: Path, renderer_format: str, output_file: Path) -> Optional[str]:
+    """Render one JSON recipe to output_file in a worker; returns an error message or None."""
+    # The renderer picks its own file name and subdirectory, so render into this worker's
+    # staging directory (on the same filesystem) and rename the result into place
+    result = _convert_renderer.render_from_json(json_file, renderer_format, _convert_staging_dir)
+    if not result.success:
+        return result.error
+    
+    os.replace(result.data.output_path, output_file)
+    return None
+
 def _convert_batch(input_dir: Path, output_dir: Path, settings: Settings, verbose: bool, format_override: Optional[str] = None) -> int:
     """Convert all JSON files in a directory to another format."""
     
@@ -273,7 +360,7 @@ def _convert_batch(input_dir: Path, output_dir: Path, settings: Settings, verbos
         return 1
     
     # Find all JSON files in input directory
-    json_files = list(input_dir.glob("*.json"))
+    json_files = _list_files(input_dir, ".json")
     if not json_files:
         console.print(f"[bold red]✗ No JSON files found in:[/bold red] {input_dir}")
         return 1
@@ -288,8 +375,9 @@ def _convert_batch(input_dir: Path, output_dir: Path, settings: Settings, verbos
     else:
         # Auto-detect format from existing files in output directory
         detected_format = None
-        html_files = list(output_dir.glob("*.html"))
-        tex_files = list(output_dir.glob("*.tex"))
+        output_files = _list_files(output_dir, (".html", ".tex"))
+        html_files = [f for f in output_files if f.suffix == ".html"]
+        tex_files = [f for f in output_files if f.suffix == ".tex"]
         
         if html_files and not tex_files:
             detected_format = 'html'
@@ -308,11 +396,7 @@ def _convert_batch(input_dir: Path, output_dir: Path, settings: Settings, verbos
             detected_format = 'html'
             console.print(f"[bold blue]Defaulting to HTML format for batch conversion[/bold blue]")
     
-    format_mapping = {
-        "latex": "cookbook",
-        "html": "strangetom"
-    }
-    renderer_format = format_mapping.get(detected_format, detected_format)
+    renderer_format = _FORMAT_MAPPING.get(detected_format, detected_format)
     file_extension = '.html' if detected_format == 'html' else '.tex'
     
     console.print(f"[bold blue]Batch converting {len(json_files)} JSON files[/bold blue]")
@@ -320,63 +404,62 @@ def _convert_batch(input_dir: Path, output_dir: Path, settings: Settings, verbos
     console.print(f"[bold blue]Output directory:[/bold blue] {output_dir}")
     console.print(f"[bold blue]Output format:[/bold blue] {detected_format}")
     
-    # Initialize renderer
-    try:
-        from .agents.renderer import RendererAgent
-        renderer = RendererAgent(settings)
-    except Exception as e:
-        console.print(f"[bold red]✗ Failed to initialize renderer:[/bold red] {str(e)}")
-        return 1
-    
-    # Track results
-    successful = 0
-    failed = 0
-    failed_files = []
-    
-    # Convert each JSON file
-    for i, json_file in enumerate(json_files, 1):
-        # Generate output filename
-        output_filename = json_file.stem + file_extension
-        output_file = output_dir / output_filename
+    # Workers stage renders in a directory next to the outputs; cookbook renders also leave
+    # images and class files there, which later files reuse
+    with tempfile.TemporaryDirectory(prefix=".convert-", dir=output_dir) as staging_root:
+        # Initialize renderer (also creates any missing default templates before workers start)
+        try:
+            _init_convert_worker(settings, staging_root)
+        except Exception as e:
+            console.print(f"[bold red]✗ Failed to initialize renderer:[/bold red] {str(e)}")
+            return 1
         
-        if verbose:
-            console.print(f"\n[bold cyan]Converting {i}/{len(json_files)}:[/bold cyan] {json_file.name}")
+        # Track results
+        successful = 0
+        failed = 0
+        failed_files = []
+        
+        # Rendering is CPU-bound, so fan the files out across processes; the platform's default
+        # start method is kept, since forking is unsafe on macOS once requests or system frameworks are loaded
+        max_workers = max(1, min(os.cpu_count() or 1, len(json_files)))
+        if max_workers > 1:
+            executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_convert_worker,
+                                           initargs=(settings, staging_root))
         else:
-            console.print(f"[cyan]{i}/{len(json_files)}[/cyan] {json_file.name}")
+            # A single worker gains nothing from a separate process; use the renderer built above
+            executor = ThreadPoolExecutor(max_workers=1)
         
-        try:
-            # Create a temporary working directory for the renderer
-            import tempfile
-            import shutil
+        with executor:
+            futures = {
+                executor.submit(_convert_json_file, json_file, renderer_format, output_dir / (json_file.stem + file_extension)): json_file
+                for json_file in json_files
+            }
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                
-                # Convert JSON to requested format using temp directory
-                result = renderer.render_from_json(json_file, renderer_format, temp_path)
+            for i, future in enumerate(as_completed(futures), 1):
+                json_file = futures[future]
+                output_file = output_dir / (json_file.stem + file_extension)
                 
-                # Move the generated file to the correct location in the batch output directory
-                if result.success:
-                    generated_path = result.data.output_path
-                    # Move from temp directory to final output location
-                    if output_file.exists():
-                        output_file.unlink()  # Remove existing file
-                    shutil.move(str(generated_path), str(output_file))
-                    result.data.output_path = output_file
-            
-            if result.success:
-                successful += 1
                 if verbose:
-                    console.print(f"[green]✓ Success:[/green] {output_file}")
-            else:
-                failed += 1
-                failed_files.append((json_file.name, result.error))
-                console.print(f"[red]✗ Failed:[/red] {result.error}")
+                    console.print(f"\n[bold cyan]Converted {i}/{len(json_files)}:[/bold cyan] {json_file.name}")
+                else:
+                    _print_progress(i, len(json_files), json_file.name)
                 
-        except Exception as e:
-            failed += 1
-            failed_files.append((json_file.name, str(e)))
-            console.print(f"[red]✗ Error:[/red] {str(e)}")
+                try:
+                    error = future.result()
+                    
+                    if error is None:
+                        successful += 1
+                        if verbose:
+                            console.print(f"[green]✓ Success:[/green] {output_file}")
+                    else:
+                        failed += 1
+                        failed_files.append((json_file.name, error))
+                        console.print(f"[red]✗ Failed:[/red] {error}")
+                        
+                except Exception as e:
+                    failed += 1
+                    failed_files.append((json_file.name, str(e)))
+                    console.print(f"[red]✗ Error:[/red] {str(e)}")
     
     # Summary
     console.print(f"\n[bold]Batch conversion complete![/bold]")
@@ -418,56 +501,61 @@ def compile(
         console.print(f"[bold blue]Output PDF:[/bold blue] {output_name}.pdf")
     
     try:
-        import subprocess
-        import shutil
-        
         # Check if XeLaTeX is available
-        if not shutil.which("xelatex"):
+        xelatex = _find_xelatex()
+        if not xelatex:
             console.print("[bold red]✗ XeLaTeX not found![/bold red]")
             console.print("Please install XeLaTeX (part of TeX Live or MiKTeX)")
             return 1
         
-        # Change to cookbook directory for compilation
+        # Change to cookbook directory for compilation (paths below must not be relative to the old cwd)
+        cookbook_dir = cookbook_dir.resolve()
         original_cwd = Path.cwd()
         try:
-            import os
             os.chdir(cookbook_dir)
             
-            # Run XeLaTeX compilation (twice for proper cross-references)
+            # Run XeLaTeX compilation (a second pass only when cross-references need it)
             console.print("[bold yellow]Running XeLaTeX compilation...[/bold yellow]")
             
+            from .utils.latex_build import needs_rerun, read_auxiliary_state
+            
             for run_num in [1, 2]:
                 if verbose:
                     console.print(f"[blue]XeLaTeX run {run_num}/2[/blue]")
                 
+                auxiliary_state = read_auxiliary_state("main")
+                # XeLaTeX reports errors on stdout and also writes them to main.log, so only
+                # stderr is worth keeping when not verbose
                 result = subprocess.run([
-                    "xelatex", 
+                    xelatex,
                     "-interaction=nonstopmode",
                     "-output-directory=.",
                     "main.tex"
-                ], capture_output=not verbose, text=True)
+                ], stdout=None if verbose else subprocess.DEVNULL,
+                   stderr=None if verbose else subprocess.PIPE, text=True)
                 
                 if result.returncode != 0:
                     console.print(f"[bold red]✗ XeLaTeX compilation failed on run {run_num}[/bold red]")
                     if not verbose and result.stderr:
                         console.print(f"Error: {result.stderr}")
                     return 1
+                
+                if not needs_rerun("main", auxiliary_state):
+                    break
             
             # Rename output PDF
             main_pdf = cookbook_dir / "main.pdf"
             output_pdf = cookbook_dir / f"{output_name}.pdf"
             
-            if main_pdf.exists():
-                if output_pdf.exists():
-                    output_pdf.unlink()  # Remove existing file
-                main_pdf.rename(output_pdf)
-                
-                console.print(f"[bold green]✓ Cookbook compiled successfully![/bold green]")
-                console.print(f"[bold green]PDF saved as:[/bold green] {output_pdf}")
-            else:
+            try:
+                main_pdf.replace(output_pdf)  # Overwrites any existing file
+            except FileNotFoundError:
                 console.print("[bold red]✗ PDF output not found![/bold red]")
                 return 1
             
+            console.print(f"[bold green]✓ Cookbook compiled successfully![/bold green]")
+            console.print(f"[bold green]PDF saved as:[/bold green] {output_pdf}")
+            
             # Clean auxiliary files if requested
             if clean:
                 if verbose:
@@ -476,10 +564,12 @@ def compile(
                 aux_extensions = ['.aux', '.log', '.fls', '.fdb_latexmk', '.synctex.gz', '.toc']
                 for ext in aux_extensions:
                     aux_file = cookbook_dir / f"main{ext}"
-                    if aux_file.exists():
+                    try:
                         aux_file.unlink()
-                        if verbose:
-                            console.print(f"Removed: {aux_file.name}")
+                    except FileNotFoundError:
+                        continue
+                    if verbose:
+                        console.print(f"Removed: {aux_file.name}")
                 
                 console.print("[green]Auxiliary files cleaned[/green]")
         
@@ -514,14 +604,16 @@ def add_recipes(
       No auto-build:     add-recipes recipes/ images/ cookbook/ --no-build
     """
     
+    # Validate input directories before doing any setup
+    if not _validate_dirs(("JSON", json_dir), ("Image", image_dir), ("Cookbook", cookbook_dir)):
+        return 1
+    
     # Import here to avoid circular imports
     from .agents.cookbook_compiler import CookbookCompilerAgent
     from config.settings import OutputSettings
-    import json
     
     # Setup logging
     if verbose:
-        import logging
         logging.basicConfig(level=logging.INFO, format='%(name)s - %(levelname)s - %(message)s')
     
     console.print(f"[bold blue]Adding recipes to existing cookbook:[/bold blue]")
@@ -529,19 +621,6 @@ def add_recipes(
     console.print(f"  Images: {image_dir}")
     console.print(f"  Cookbook: {cookbook_dir}")
     
-    # Validate input directories
-    if not json_dir.exists() or not json_dir.is_dir():
-        console.print(f"[bold red]✗ JSON directory not found:[/bold red] {json_dir}")
-        return 1
-    
-    if not image_dir.exists() or not image_dir.is_dir():
-        console.print(f"[bold red]✗ Image directory not found:[/bold red] {image_dir}")
-        return 1
-    
-    if not cookbook_dir.exists() or not cookbook_dir.is_dir():
-        console.print(f"[bold red]✗ Cookbook directory not found:[/bold red] {cookbook_dir}")
-        return 1
-    
     # Check for main.tex in cookbook directory
     main_tex = cookbook_dir / "main.tex"
     if not main_tex.exists():
@@ -550,34 +629,33 @@ def add_recipes(
         return 1
     
     # Find all available JSON files
-    json_files = list(json_dir.glob("*.json"))
+    json_files = _list_files(json_dir, ".json")
     if not json_files:
         console.print(f"[bold red]✗ No JSON files found in:[/bold red] {json_dir}")
         return 1
     
     # Find existing recipe files in cookbook
     recipes_dir = cookbook_dir / "recipes"
-    existing_recipes = set()
-    if recipes_dir.exists():
-        for tex_file in recipes_dir.glob("*.tex"):
-            existing_recipes.add(tex_file.stem)
+    try:
+        existing_recipes = {tex_file.stem for tex_file in _list_files(recipes_dir, ".tex")}
+    except FileNotFoundError:
+        existing_recipes = set()
     
-    # Determine which recipes need to be added
-    available_recipes = {json_file.stem for json_file in json_files}
-    new_recipes = available_recipes - existing_recipes
+    # Determine which recipes need to be added (file stems are unique within one directory)
+    new_json_files = [json_file for json_file in json_files if json_file.stem not in existing_recipes]
     
-    if not new_recipes:
+    if not new_json_files:
         console.print(f"[bold green]✓ No new recipes to add![/bold green]")
-        console.print(f"All {len(available_recipes)} recipes are already in the cookbook.")
+        console.print(f"All {len(json_files)} recipes are already in the cookbook.")
         return 0
     
-    console.print(f"[green]Found {len(available_recipes)} total recipes[/green]")
+    console.print(f"[green]Found {len(json_files)} total recipes[/green]")
     console.print(f"[blue]Existing recipes: {len(existing_recipes)}[/blue]")
-    console.print(f"[yellow]New recipes to add: {len(new_recipes)}[/yellow]")
+    console.print(f"[yellow]New recipes to add: {len(new_json_files)}[/yellow]")
     
     if verbose:
         console.print(f"[bold cyan]New recipes:[/bold cyan]")
-        for recipe in sorted(new_recipes):
+        for recipe in sorted(json_file.stem for json_file in new_json_files):
             console.print(f"  • {recipe}")
     
     try:
@@ -589,32 +667,18 @@ def add_recipes(
         # Get existing cookbook metadata from main.tex
         metadata = compiler._extract_cookbook_metadata(main_tex)
         
-        # Filter JSON files to only new recipes
-        new_json_files = [f for f in json_files if f.stem in new_recipes]
-        
-        # Create a temporary directory with only new recipes
-        import tempfile
-        import shutil
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_json_dir = Path(temp_dir) / "json"
-            temp_json_dir.mkdir()
-            
-            # Copy only new JSON files to temp directory
-            for json_file in new_json_files:
-                shutil.copy2(json_file, temp_json_dir)
-            
-            # Add new recipes to existing cookbook
-            success = compiler.add_recipes_to_cookbook(
-                new_json_dir=temp_json_dir,
-                image_dir=image_dir,
-                cookbook_dir=cookbook_dir,
-                max_pages_per_recipe=max_pages,
-                auto_build=not no_build
-            )
+        # Add new recipes to existing cookbook
+        success = compiler.add_recipes_to_cookbook(
+            new_json_dir=json_dir,
+            image_dir=image_dir,
+            cookbook_dir=cookbook_dir,
+            max_pages_per_recipe=max_pages,
+            auto_build=not no_build,
+            json_files=new_json_files
+        )
         
         if success:
-            console.print(f"[bold green]✓ Successfully added {len(new_recipes)} new recipes![/bold green]")
+            console.print(f"[bold green]✓ Successfully added {len(new_json_files)} new recipes![/bold green]")
             console.print(f"[bold green]Updated cookbook:[/bold green] {cookbook_dir}")
             
             if not no_build:
@@ -649,6 +713,7 @@ def cookbook(
     max_pages: int = typer.Option(1, help="Maximum pages per recipe"),
     no_build: bool = typer.Option(False, "--no-build", help="Don't build PDF automatically"),
     validate_pdf: bool = typer.Option(False, "--validate-pdf", help="Enable actual PDF compilation for validation (slower but accurate)"),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Worker processes for generating recipe files"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose logging"),
 ):
     """Compile JSON recipes and images into a complete LaTeX cookbook.
@@ -661,15 +726,19 @@ def cookbook(
       Basic cookbook:    cookbook output/json/ output/image/ cookbook_output/
       Custom title:      cookbook recipes/ images/ my_cookbook/ --title "My Recipes"
       No auto-build:     cookbook recipes/ images/ cookbook/ --no-build
+      Parallel:          cookbook recipes/ images/ cookbook/ -j 4
     """
     
+    # Validate input directories before doing any setup
+    if not _validate_dirs(("JSON", json_dir), ("Image", image_dir)):
+        return 1
+    
     # Import here to avoid circular imports
     from .agents.cookbook_compiler import CookbookCompilerAgent, CookbookMetadata
     from config.settings import OutputSettings
     
     # Setup logging
     if verbose:
-        import logging
         logging.basicConfig(level=logging.INFO, format='%(name)s - %(levelname)s - %(message)s')
     
     console.print(f"[bold blue]Compiling cookbook from:[/bold blue]")
@@ -679,17 +748,8 @@ def cookbook(
     console.print(f"  Title: {title}")
     console.print(f"  Max pages per recipe: {max_pages}")
     
-    # Validate input directories
-    if not json_dir.exists() or not json_dir.is_dir():
-        console.print(f"[bold red]✗ JSON directory not found:[/bold red] {json_dir}")
-        return 1
-    
-    if not image_dir.exists() or not image_dir.is_dir():
-        console.print(f"[bold red]✗ Image directory not found:[/bold red] {image_dir}")
-        return 1
-    
     # Check for JSON files
-    json_files = list(json_dir.glob("*.json"))
+    json_files = _list_files(json_dir, ".json")
     if not json_files:
         console.print(f"[bold red]✗ No JSON files found in:[/bold red] {json_dir}")
         return 1
@@ -716,7 +776,8 @@ def cookbook(
             output_dir=output_dir,
             metadata=metadata,
             max_pages_per_recipe=max_pages,
-            auto_build=not no_build
+            auto_build=not no_build,
+            jobs=jobs
         )
         
         if success:
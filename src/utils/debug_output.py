@@ -1,23 +1,41 @@
 """
 Debug Output Utilities
 """
+import atexit
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import singledispatch
 from pathlib import Path
 from typing import Any, Dict, Optional
 from urllib.parse import urlparse
 import re
 
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Characters removed from debug file names, and the whitespace runs replaced by '-'
+_UNSAFE_FILENAME_CHARS = str.maketrans('', '', '<>:"/\\|?*')
+_WHITESPACE_RE = re.compile(r'\s+')
+# Page extensions stripped from the URL's last path segment
+_PAGE_EXTENSION_RE = re.compile(r'\.(html?|php|aspx?)$')
+
+# Debug files are written in order on one background thread so agents don't wait on disk
+_DEBUG_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="debug-io")
+atexit.register(_DEBUG_WRITER.shutdown, wait=True)
+
 
 def sanitize_filename(text: str) -> str:
     """Convert text to safe filename."""
     # Remove or replace unsafe characters
-    safe_text = re.sub(r'[<>:"/\\|?*]', '', text)
-    safe_text = re.sub(r'\s+', '-', safe_text)
-    safe_text = safe_text.strip('-').lower()
+    safe_text = _WHITESPACE_RE.sub('-', text.translate(_UNSAFE_FILENAME_CHARS))
     # Limit length
-    return safe_text[:50] if len(safe_text) > 50 else safe_text
+    return safe_text.strip('-').lower()[:50]
 
 
 def get_recipe_name_from_url(url: str) -> str:
@@ -30,7 +48,7 @@ def get_recipe_name_from_url(url: str) -> str:
         if path_parts:
             recipe_name = path_parts[-1]
             # Remove file extensions
-            recipe_name = re.sub(r'\.(html?|php|aspx?)$', '', recipe_name)
+            recipe_name = _PAGE_EXTENSION_RE.sub('', recipe_name)
             return sanitize_filename(recipe_name)
         else:
             return sanitize_filename(parsed.netloc)
@@ -77,8 +95,11 @@ def save_agent_debug(
         filename = f"{step_number:02d}_{agent_name}.json"
         filepath = debug_dir / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(debug_data, f, indent=2, ensure_ascii=False, default=str)
+        # Encode now, while the output objects are still in this state; only the write is deferred
+        _DEBUG_WRITER.submit(
+            _write_file, filepath, _encode_json(debug_data),
+            f"Warning: Failed to save debug output for {agent_name}"
+        )
             
     except Exception as e:
         # Don't let debug failures break the main processing
@@ -110,25 +131,58 @@ def save_debug_summary(
         }
         
         filepath = debug_dir / "summary.json"
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False, default=str)
+        # Written last and waited on, so the debug directory is complete once this returns
+        _DEBUG_WRITER.submit(
+            _write_file, filepath, _encode_json(summary), "Warning: Failed to save debug summary"
+        ).result()
             
     except Exception as e:
         print(f"Warning: Failed to save debug summary: {e}")
 
 
+def _encode_json(data: Any) -> bytes:
+    """Encode indented UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            # Datetimes and dataclasses go through default=str, as with the json module
+            return orjson.dumps(data, default=str, option=(
+                orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            ))
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; fall back to the json module
+    
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def _write_file(filepath: Path, payload: bytes, warning: str) -> None:
+    """Write a debug file, reporting failures without raising."""
+    try:
+        filepath.write_bytes(payload)
+    except Exception as e:
+        # Don't let debug failures break the main processing
+        print(f"{warning}: {e}")
+
+
+@singledispatch
 def _serialize_for_json(obj: Any) -> Any:
     """Convert objects to JSON-serializable format."""
-    try:
-        # For complex objects, try to convert to dict
-        if hasattr(obj, '__dict__'):
-            return obj.__dict__
-        # For Pydantic models
-        elif hasattr(obj, 'model_dump'):
-            return obj.model_dump()
-        elif hasattr(obj, 'dict'):
-            return obj.dict()
-        else:
-            return obj
-    except Exception:
-        return str(obj)
\ No newline at end of file
+    # For complex objects, use their attributes; anything else is left to the encoder
+    return vars(obj) if hasattr(obj, '__dict__') else obj
+
+
+@_serialize_for_json.register
+def _(obj: BaseModel) -> Any:
+    # For Pydantic models
+    return obj.model_dump()
+
+
+@_serialize_for_json.register(dict)
+@_serialize_for_json.register(list)
+@_serialize_for_json.register(str)
+@_serialize_for_json.register(int)
+@_serialize_for_json.register(float)
+@_serialize_for_json.register(type(None))
+def _(obj: Any) -> Any:
+    # Already JSON-serializable
+    return obj
@@ -4,11 +4,79 @@ Density lookup utility for ingredient matching and conversions
 import pandas as pd
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
+import json
+import os
 import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from collections import Counter
 from difflib import SequenceMatcher
+from functools import lru_cache
 import logging
 from .usda_api import USDAFoodAPI
 
+# Descriptors that don't affect density, removed in this order when normalizing names
+_DESCRIPTOR_PATTERNS = [re.compile(pattern) for pattern in (
+    r'\b(fresh|dried|frozen|canned|bottled|raw|cooked|boiled|steamed)\b',
+    r'\b(organic|natural|pure)\b',
+    r'\b(with|without|added|no)\s+\w+',
+    r'\b(unsweetened|sweetened)\b',
+    r'\s*\([^)]*\)',  # Remove parenthetical content
+    r'\s*,.*$',       # Remove everything after first comma
+)]
+_WHITESPACE_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r'\w+')
+
+# USDA densities found by earlier runs; bump the version when the stored result or key format changes
+_USDA_CACHE_PATH = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "recipes_agent" / "usda_densities.sqlite3"
+_USDA_CACHE_VERSION = 2
+_USDA_CACHE_MAX_AGE = 30 * 24 * 3600
+
+# Milliliters per volume unit
+_ML_PER_UNIT = {
+    'ml': 1,
+    'milliliter': 1,
+    'milliliters': 1,
+    'l': 1000,
+    'liter': 1000,
+    'liters': 1000,
+    'litre': 1000,
+    'litres': 1000,
+    'cup': 236.588,
+    'cups': 236.588,
+    'tbsp': 14.787,
+    'tablespoon': 14.787,
+    'tablespoons': 14.787,
+    'tsp': 4.929,
+    'teaspoon': 4.929,
+    'teaspoons': 4.929,
+    'fl oz': 29.574,
+    'fluid ounce': 29.574,
+    'fluid ounces': 29.574,
+    'pint': 473.176,
+    'pints': 473.176,
+    'quart': 946.353,
+    'quarts': 946.353,
+    'gallon': 3785.41,
+    'gallons': 3785.41
+}
+
+@dataclass(slots=True, frozen=True)
+class DensityResult:
+    """Density match for an ingredient, from the local database or USDA FoodData Central."""
+    name: str
+    category: str
+    density_g_ml: float
+    specific_gravity: Optional[float]
+    source: Optional[str]
+    match_score: float
+    search_name: str
+    calculation_details: Optional[Dict[str, Any]] = None  # USDA portion used to derive the density
+
 class DensityLookup:
     """Utility for looking up ingredient densities and performing conversions."""
     
@@ -24,6 +92,9 @@ class DensityLookup:
         # Initialize USDA API for fallback lookups with configurable timeout
         self.usda_api = USDAFoodAPI(timeout=usda_timeout) if use_usda_api else None
         self.usda_cache = {}  # Cache USDA results locally
+        self.local_cache = {}  # Cache local matches by normalized name and threshold
+        self._usda_locks = {}  # Per-ingredient locks so concurrent misses share one API query
+        self._usda_locks_guard = threading.Lock()
         
     def _load_densities(self, file_path: Path) -> pd.DataFrame:
         """Load and prepare the densities database."""
@@ -81,36 +152,31 @@ class DensityLookup:
         name = str(name).lower()
         
         # Remove common descriptors that don't affect density
-        descriptors_to_remove = [
-            r'\b(fresh|dried|frozen|canned|bottled|raw|cooked|boiled|steamed)\b',
-            r'\b(organic|natural|pure)\b',
-            r'\b(with|without|added|no)\s+\w+',
-            r'\b(unsweetened|sweetened)\b',
-            r'\s*\([^)]*\)',  # Remove parenthetical content
-            r'\s*,.*$',       # Remove everything after first comma
-        ]
-        
-        for pattern in descriptors_to_remove:
-            name = re.sub(pattern, '', name)
+        for pattern in _DESCRIPTOR_PATTERNS:
+            name = pattern.sub('', name)
         
         # Clean up extra spaces
-        name = re.sub(r'\s+', ' ', name).strip()
+        name = _WHITESPACE_RE.sub(' ', name).strip()
         
         return name
     
     def _build_search_index(self):
         """Build search index for faster lookups."""
-        if self.densities_df.empty:
-            self.search_index = {}
-            return
-            
+        # Keep each column as a plain list; the index maps names to row positions in them
+        df = self.densities_df
+        self._names = self._column_values(df, 'Food name and description')
+        self._categories = self._column_values(df, 'category')
+        self._densities = self._column_values(df, 'density_g_ml')
+        self._gravities = self._column_values(df, 'Specific gravity')
+        self._sources = self._column_values(df, 'BiblioID')
+        self._search_names = self._column_values(df, 'search_name')
+        
         self.search_index = {}
         
-        for _, row in self.densities_df.iterrows():
-            search_name = row['search_name']
+        for row_id, search_name in enumerate(self._search_names):
             if search_name:
                 # Add full name
-                self.search_index[search_name] = row
+                self.search_index[search_name] = row_id
                 
                 # Add individual words for partial matching
                 words = search_name.split()
@@ -120,9 +186,19 @@ class DensityLookup:
                             self.search_index[word] = []
                         if not isinstance(self.search_index[word], list):
                             self.search_index[word] = [self.search_index[word]]
-                        self.search_index[word].append(row)
+                        self.search_index[word].append(row_id)
+        
+        # Character counts per name, for the quick similarity bound in fuzzy matching
+        self._char_counts = {name: dict(Counter(name)) for name in self._search_names if name}
+    
+    @staticmethod
+    def _column_values(df: pd.DataFrame, column: str) -> list:
+        """Values of a column as a plain list, or Nones if the column is missing."""
+        if column in df:
+            return df[column].tolist()
+        return [None] * len(df)
     
-    def find_density(self, ingredient_name: str, threshold: float = 0.6) -> Optional[Dict[str, Any]]:
+    def find_density(self, ingredient_name: str, threshold: float = 0.6) -> Optional[DensityResult]:
         """
         Find density for an ingredient name.
         
@@ -131,7 +207,7 @@ class DensityLookup:
             threshold: Minimum similarity score for matching
             
         Returns:
-            Dictionary with density info or None if not found
+            DensityResult or None if not found
         """
         if not ingredient_name:
             return None
@@ -147,31 +223,56 @@ class DensityLookup:
         
         return None
     
-    def _find_density_local(self, ingredient_name: str, threshold: float = 0.6) -> Optional[Dict[str, Any]]:
+    def prefetch_densities(self, ingredient_names: List[str], threshold: float = 0.6):
+        """
+        Warm the lookup caches for several ingredients, querying USDA for local misses concurrently.
+        
+        Later find_density calls for these names are answered from the caches.
+        """
+        names = list(dict.fromkeys(name for name in ingredient_names if name))
+        misses = [name for name in names if not self._find_density_local(name, threshold)]
+        if not self.usda_api or not misses:
+            return
+        
+        # USDA lookups are network-bound, so overlap them rather than waiting on each in turn
+        with ThreadPoolExecutor(max_workers=min(8, len(misses))) as executor:
+            list(executor.map(self._find_density_usda, misses))
+    
+    def _find_density_local(self, ingredient_name: str, threshold: float = 0.6) -> Optional[DensityResult]:
         """Find density in local database."""
         if self.densities_df.empty:
             return None
             
         normalized_name = self._normalize_ingredient_name(ingredient_name)
         
+        # Recipes repeat the same ingredients, so remember each match (or miss)
+        cache_key = (normalized_name, threshold)
+        if cache_key not in self.local_cache:
+            self.local_cache[cache_key] = self._match_density_local(normalized_name, threshold)
+        return self.local_cache[cache_key]
+    
+    def _match_density_local(self, normalized_name: str, threshold: float) -> Optional[DensityResult]:
+        """Match a normalized ingredient name against the local database."""
         # Try exact match first
         if normalized_name in self.search_index:
-            row = self.search_index[normalized_name]
-            if not isinstance(row, list):
-                return self._format_density_result(row, 1.0)
+            row_id = self.search_index[normalized_name]
+            if not isinstance(row_id, list):
+                return self._format_density_result(row_id, 1.0)
         
         # Try fuzzy matching
         best_match = None
         best_score = 0
+        matcher = SequenceMatcher(None, normalized_name)
+        name_counts = Counter(normalized_name)
         
-        for search_name, row in self.search_index.items():
-            if isinstance(row, list):
+        for search_name, row_id in self.search_index.items():
+            if isinstance(row_id, list):
                 continue  # Skip word-based entries for fuzzy matching
                 
-            similarity = SequenceMatcher(None, normalized_name, search_name).ratio()
-            if similarity > best_score and similarity >= threshold:
+            similarity = self._similarity(matcher, name_counts, search_name, max(best_score, threshold))
+            if similarity is not None and similarity > best_score and similarity >= threshold:
                 best_score = similarity
-                best_match = row
+                best_match = row_id
         
         if best_match is not None:
             return self._format_density_result(best_match, best_score)
@@ -181,33 +282,74 @@ class DensityLookup:
         for word in words:
             if word in self.search_index and isinstance(self.search_index[word], list):
                 # Find best match among word matches
-                for row in self.search_index[word]:
-                    similarity = SequenceMatcher(None, normalized_name, row['search_name']).ratio()
-                    if similarity > best_score and similarity >= threshold:
+                for row_id in self.search_index[word]:
+                    similarity = self._similarity(
+                        matcher, name_counts, self._search_names[row_id], max(best_score, threshold)
+                    )
+                    if similarity is not None and similarity > best_score and similarity >= threshold:
                         best_score = similarity
-                        best_match = row
+                        best_match = row_id
         
         if best_match is not None:
             return self._format_density_result(best_match, best_score)
         
         return None
     
-    def _find_density_usda(self, ingredient_name: str) -> Optional[Dict[str, Any]]:
+    def _similarity(self, matcher: SequenceMatcher, name_counts: Counter, candidate: str,
+                    floor: float) -> Optional[float]:
+        """Similarity of the matcher's name to candidate, or None if cheap upper bounds show it is below floor."""
+        # Same bounds as difflib.get_close_matches: length-only first, then character counts
+        total_length = len(matcher.a) + len(candidate)
+        if 2.0 * min(len(matcher.a), len(candidate)) / total_length < floor:
+            return None
+        # quick_ratio() from precomputed counts, so rejected candidates never reach the matcher
+        candidate_counts = self._char_counts[candidate]
+        shared = sum(min(count, candidate_counts.get(char, 0)) for char, count in name_counts.items())
+        if 2.0 * shared / total_length < floor:
+            return None
+        matcher.set_seq2(candidate)
+        return matcher.ratio()
+    
+    def _find_density_usda(self, ingredient_name: str) -> Optional[DensityResult]:
         """Find density using USDA API."""
+        # Key on the lowercased words, so "Brown  Sugar" and "brown sugar," share one USDA result; order is kept,
+        # since "milk chocolate" and "chocolate milk" are different foods
+        usda_key = ' '.join(_WORD_RE.findall(ingredient_name.lower()))
+        
         # Check USDA cache first
-        if ingredient_name in self.usda_cache:
-            return self.usda_cache[ingredient_name]
+        if usda_key in self.usda_cache:
+            return self.usda_cache[usda_key]
+        
+        # A caller already querying this ingredient fills the cache; wait for it instead of querying again
+        with self._usda_locks_guard:
+            ingredient_lock = self._usda_locks.setdefault(usda_key, threading.Lock())
+        with ingredient_lock:
+            if usda_key in self.usda_cache:
+                return self.usda_cache[usda_key]
+            return self._query_usda(ingredient_name, usda_key)
+    
+    def _query_usda(self, ingredient_name: str, usda_key: str) -> Optional[DensityResult]:
+        """Look up a USDA density on disk, then from the API, and cache it."""
+        # Results stored on disk by earlier runs
+        cache_key = f"v{_USDA_CACHE_VERSION}:{usda_key}"
+        density_info = self._read_usda_disk_cache(cache_key)
+        if density_info:
+            self.usda_cache[usda_key] = density_info
+            return density_info
         
         self.logger.info(f"Querying USDA API for density: {ingredient_name}")
         
         try:
             density_info = self.usda_api.find_density_info(ingredient_name)
+            if density_info:
+                density_info = DensityResult(**density_info)
             
             # Cache the result (even if None)
-            self.usda_cache[ingredient_name] = density_info
+            self.usda_cache[usda_key] = density_info
             
             if density_info:
-                self.logger.info(f"Found USDA density {density_info['density_g_ml']:.3f} g/ml for {ingredient_name}")
+                self.logger.info(f"Found USDA density {density_info.density_g_ml:.3f} g/ml for {ingredient_name}")
+                self._write_usda_disk_cache(cache_key, density_info)
             else:
                 self.logger.debug(f"No USDA density found for {ingredient_name}")
             
@@ -217,17 +359,47 @@ class DensityLookup:
             self.logger.error(f"Error querying USDA API for {ingredient_name}: {e}")
             return None
     
-    def _format_density_result(self, row: pd.Series, score: float) -> Dict[str, Any]:
+    def _read_usda_disk_cache(self, cache_key: str) -> Optional[DensityResult]:
+        """Return a density found by an earlier run, if one is stored and not expired."""
+        if not _USDA_CACHE_PATH.exists():
+            return None
+        try:
+            with closing(sqlite3.connect(_USDA_CACHE_PATH)) as connection:
+                row = connection.execute(
+                    "SELECT value FROM usda_densities WHERE key = ? AND stored_at > ?",
+                    (cache_key, time.time() - _USDA_CACHE_MAX_AGE)
+                ).fetchone()
+            return DensityResult(**json.loads(row[0])) if row else None
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            self.logger.debug(f"Could not read USDA density cache: {e}")
+            return None
+    
+    def _write_usda_disk_cache(self, cache_key: str, density_info: DensityResult):
+        """Store a USDA density for later runs; misses are not stored so they are retried."""
+        try:
+            _USDA_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(_USDA_CACHE_PATH)) as connection, connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS usda_densities (key TEXT PRIMARY KEY, value TEXT, stored_at REAL)"
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO usda_densities VALUES (?, ?, ?)",
+                    (cache_key, json.dumps(asdict(density_info)), time.time())
+                )
+        except (OSError, sqlite3.Error) as e:
+            self.logger.debug(f"Could not write USDA density cache: {e}")
+    
+    def _format_density_result(self, row_id: int, score: float) -> DensityResult:
         """Format density lookup result."""
-        return {
-            'name': row['Food name and description'],
-            'category': row['category'],
-            'density_g_ml': row['density_g_ml'],
-            'specific_gravity': row.get('Specific gravity'),
-            'source': row.get('BiblioID'),
-            'match_score': score,
-            'search_name': row['search_name']
-        }
+        return DensityResult(
+            name=self._names[row_id],
+            category=self._categories[row_id],
+            density_g_ml=self._densities[row_id],
+            specific_gravity=self._gravities[row_id],
+            source=self._sources[row_id],
+            match_score=score,
+            search_name=self._search_names[row_id]
+        )
     
     def calculate_weight_from_volume(self, volume_ml: float, density_g_ml: float) -> float:
         """Calculate weight in grams from volume in ml and density."""
@@ -239,37 +411,8 @@ class DensityLookup:
     
     def convert_volume_units_to_ml(self, quantity: float, unit: str) -> Optional[float]:
         """Convert volume units to milliliters."""
-        unit = unit.lower().strip()
-        
-        conversions = {
-            'ml': 1,
-            'milliliter': 1,
-            'milliliters': 1,
-            'l': 1000,
-            'liter': 1000,
-            'liters': 1000,
-            'litre': 1000,
-            'litres': 1000,
-            'cup': 236.588,
-            'cups': 236.588,
-            'tbsp': 14.787,
-            'tablespoon': 14.787,
-            'tablespoons': 14.787,
-            'tsp': 4.929,
-            'teaspoon': 4.929,
-            'teaspoons': 4.929,
-            'fl oz': 29.574,
-            'fluid ounce': 29.574,
-            'fluid ounces': 29.574,
-            'pint': 473.176,
-            'pints': 473.176,
-            'quart': 946.353,
-            'quarts': 946.353,
-            'gallon': 3785.41,
-            'gallons': 3785.41
-        }
-        
-        return conversions.get(unit, None) * quantity if unit in conversions else None
+        factor = _ML_PER_UNIT.get(unit.lower().strip())
+        return factor * quantity if factor is not None else None
     
     def get_ingredient_suggestions(self, partial_name: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Get ingredient name suggestions for partial matches."""
@@ -279,13 +422,20 @@ class DensityLookup:
         normalized_partial = self._normalize_ingredient_name(partial_name)
         suggestions = []
         
-        for _, row in self.densities_df.iterrows():
-            search_name = row['search_name']
+        for row_id, search_name in enumerate(self._search_names):
+            if len(suggestions) == limit:
+                break
             if normalized_partial in search_name:
                 suggestions.append({
-                    'name': row['Food name and description'],
-                    'category': row['category'],
-                    'density_g_ml': row['density_g_ml']
+                    'name': self._names[row_id],
+                    'category': self._categories[row_id],
+                    'density_g_ml': self._densities[row_id]
                 })
                 
-        return suggestions[:limit]
\ No newline at end of file
+        return suggestions[:limit]
+
+
+@lru_cache(maxsize=None)
+def get_density_lookup(densities_file: str = None, use_usda_api: bool = True, usda_timeout: int = 30) -> DensityLookup:
+    """Return a DensityLookup shared per configuration, so the database is loaded and indexed once per process."""
+    return DensityLookup(densities_file, use_usda_api=use_usda_api, usda_timeout=usda_timeout)
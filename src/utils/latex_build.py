@@ -0,0 +1,31 @@
+"""
+LaTeX Build Utilities
+"""
+import re
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Log messages LaTeX, hyperref and rerunfilecheck write when another pass would change the output
+RERUN_PATTERN = re.compile(rb'Rerun to get|There were undefined references|Label\(s\) may have changed')
+
+
+def read_auxiliary_state(jobname: str, directory: Path = Path('.')) -> Tuple[Optional[bytes], ...]:
+    """Snapshot the .aux and .toc files that the next XeLaTeX pass reads back in."""
+    state = []
+    for extension in ('.aux', '.toc'):
+        try:
+            state.append((directory / f"{jobname}{extension}").read_bytes())
+        except OSError:
+            state.append(None)
+    return tuple(state)
+
+
+def needs_rerun(jobname: str, previous_state: Tuple[Optional[bytes], ...], directory: Path = Path('.')) -> bool:
+    """Decide like latexmk whether another pass is needed: the auxiliary files changed or the log asks for it."""
+    if read_auxiliary_state(jobname, directory) != previous_state:
+        return True
+    try:
+        log = (directory / f"{jobname}.log").read_bytes()
+    except OSError:
+        return True
+    return RERUN_PATTERN.search(log) is not None
@@ -2,25 +2,76 @@
 USDA FoodData Central API integration for ingredient density lookup
 """
 import os
+import re
 import requests
+from requests.adapters import HTTPAdapter
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from dotenv import load_dotenv
 import time
+import threading
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load environment variables
 load_dotenv()
 
+# Amount followed by a volume unit in USDA portion descriptions; the matched group names the unit
+_VOLUME_RE = re.compile(
+    r'(\d+(?:\.\d+)?)\s*(?:'
+    r'(?P<cup>cups?)'
+    r'|(?P<tablespoon>tablespoons?|tbsps?)'
+    r'|(?P<teaspoon>teaspoons?|tsps?)'
+    r'|(?P<fluid_ounce>fluid\s*ounces?|fl\s*ozs?)'
+    r'|(?P<ml>milliliters?|mls?)'
+    r'|(?P<liter>liters?)'
+    r'|(?P<pint>pints?)'
+    r'|(?P<quart>quarts?)'
+    r'|(?P<gallon>gallons?))'
+)
+
+# Milliliters per canonical unit name returned by _parse_portion_description
+_ML_PER_UNIT = {
+    'cup': 236.588,
+    'tablespoon': 14.787,
+    'teaspoon': 4.929,
+    'fluid ounce': 29.574,
+    'ml': 1,
+    'liter': 1000,
+    'pint': 473.176,
+    'quart': 946.353,
+    'gallon': 3785.41
+}
+
+# API responses kept in memory; detail responses carry full nutrient lists, so keep the bound modest
+_CACHE_MAX_ENTRIES = 1024
+
+def _decode_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, with orjson when it is installed."""
+    return orjson.loads(response.content) if orjson is not None else response.json()
+
 class USDAFoodAPI:
     """Interface to USDA FoodData Central API for ingredient data."""
     
+    # Responses don't depend on the key or timeout, so every client in the process shares one cache
+    _shared_cache = OrderedDict()
+    _shared_cache_lock = threading.Lock()
+    
     def __init__(self, api_key: str = None, timeout: int = 30):
         """Initialize with API key and timeout."""
         self.api_key = api_key or os.getenv('USDA')
         self.base_url = "https://api.nal.usda.gov/fdc/v1"
         self.logger = logging.getLogger(__name__)
         self.session = requests.Session()
-        self.cache = {}  # Simple in-memory cache
+        # One host shared by concurrent lookups; retries are handled by the request loops below
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.cache = USDAFoodAPI._shared_cache  # In-memory LRU cache of API responses
+        self._cache_lock = USDAFoodAPI._shared_cache_lock
         self.timeout = timeout  # Configurable timeout, default 30 seconds
         
         if not self.api_key:
@@ -40,10 +91,14 @@ class USDAFoodAPI:
         if not self.api_key:
             return []
         
+        # Recipe text varies in case and spacing; the search doesn't, so share one cache entry
+        query = ' '.join(query.lower().split())
+        
         # Check cache first
-        cache_key = f"search_{query}_{max_results}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cache_key = ('search', query, max_results)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
         
         url = f"{self.base_url}/foods/search"
         params = {
@@ -59,21 +114,21 @@ class USDAFoodAPI:
                 response = self.session.get(url, params=params, timeout=self.timeout)
                 response.raise_for_status()
                 
-                foods = response.json().get("foods", [])
+                foods = _decode_json(response).get("foods", [])
                 
                 # Cache result
-                self.cache[cache_key] = foods
+                self._set_cached(cache_key, foods)
                 
-                self.logger.debug(f"Found {len(foods)} foods for query: {query}")
+                self.logger.debug("Found %d foods for query: %s", len(foods), query)
                 return foods
                 
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, ValueError) as e:
                 if attempt < 2:  # Don't wait after the last attempt
                     wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s
-                    self.logger.warning(f"USDA API timeout for '{query}', retrying in {wait_time}s (attempt {attempt + 1}/3)")
+                    self.logger.warning("USDA API timeout for '%s', retrying in %ds (attempt %d/3)", query, wait_time, attempt + 1)
                     time.sleep(wait_time)
                 else:
-                    self.logger.error(f"Error searching USDA API for '{query}' after 3 attempts: {e}")
+                    self.logger.error("Error searching USDA API for '%s' after 3 attempts: %s", query, e)
                     return []
     
     def get_food_details(self, fdc_id: int) -> Optional[Dict[str, Any]]:
@@ -90,9 +145,10 @@ class USDAFoodAPI:
             return None
         
         # Check cache first
-        cache_key = f"details_{fdc_id}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cache_key = ('details', fdc_id)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
         
         url = f"{self.base_url}/food/{fdc_id}"
         params = {"api_key": self.api_key}
@@ -103,22 +159,75 @@ class USDAFoodAPI:
                 response = self.session.get(url, params=params, timeout=self.timeout)
                 response.raise_for_status()
                 
-                details = response.json()
+                details = _decode_json(response)
                 
                 # Cache result
-                self.cache[cache_key] = details
+                self._set_cached(cache_key, details)
                 
                 return details
                 
-            except requests.exceptions.RequestException as e:
+            except (requests.exceptions.RequestException, ValueError) as e:
                 if attempt < 2:  # Don't wait after the last attempt
                     wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s
-                    self.logger.warning(f"USDA API timeout for ID {fdc_id}, retrying in {wait_time}s (attempt {attempt + 1}/3)")
+                    self.logger.warning("USDA API timeout for ID %s, retrying in %ds (attempt %d/3)", fdc_id, wait_time, attempt + 1)
                     time.sleep(wait_time)
                 else:
-                    self.logger.error(f"Error getting USDA food details for ID {fdc_id} after 3 attempts: {e}")
+                    self.logger.error("Error getting USDA food details for ID %s after 3 attempts: %s", fdc_id, e)
                     return None
     
+    def get_foods_details(self, fdc_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get detailed food information for several foods in one request.
+        
+        Args:
+            fdc_ids: FoodData Central IDs
+            
+        Returns:
+            Detailed food information by FDC ID; foods that were not found are left out
+        """
+        if not self.api_key:
+            return {}
+        
+        # Check cache first, then fetch the rest together
+        details_by_id = {}
+        missing_ids = []
+        for fdc_id in dict.fromkeys(fdc_ids):
+            cached = self._get_cached(('details', fdc_id))
+            if cached is not None:
+                details_by_id[fdc_id] = cached
+            else:
+                missing_ids.append(fdc_id)
+        
+        if not missing_ids:
+            return details_by_id
+        
+        url = f"{self.base_url}/foods"
+        params = {"api_key": self.api_key}
+        
+        # Try up to 3 times with exponential backoff
+        for attempt in range(3):
+            try:
+                response = self.session.post(url, params=params, json={"fdcIds": missing_ids}, timeout=self.timeout)
+                response.raise_for_status()
+                
+                for details in _decode_json(response):
+                    fdc_id = details.get('fdcId')
+                    if fdc_id in missing_ids:
+                        # Cache each food under its own ID, shared with get_food_details
+                        self._set_cached(('details', fdc_id), details)
+                        details_by_id[fdc_id] = details
+                
+                return details_by_id
+                
+            except (requests.exceptions.RequestException, ValueError) as e:
+                if attempt < 2:  # Don't wait after the last attempt
+                    wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s
+                    self.logger.warning("USDA API timeout for IDs %s, retrying in %ds (attempt %d/3)", missing_ids, wait_time, attempt + 1)
+                    time.sleep(wait_time)
+                else:
+                    self.logger.error("Error getting USDA food details for IDs %s after 3 attempts: %s", missing_ids, e)
+                    return details_by_id
+    
     def find_density_info(self, ingredient_name: str) -> Optional[Dict[str, Any]]:
         """
         Find density information for an ingredient using USDA API.
@@ -139,45 +248,80 @@ class USDAFoodAPI:
             return None
         
         # Look for the best match with portion data
-        for food in foods:
+        details_by_id = None
+        for position, food in enumerate(foods):
             fdc_id = food.get('fdcId')
             description = food.get('description', '')
             
             if not fdc_id:
                 continue
             
-            # Get detailed information
-            details = self.get_food_details(fdc_id)
+            # Survey (FNDDS) search hits list their household measures inline; try those before fetching details
+            measures = self._parse_volume_portions(food.get('foodMeasures', []), 'disseminationText')
+            density_info = self._density_from_portions(measures, description, fdc_id)
+            if density_info:
+                return density_info
+            
+            # Get detailed information for this and the remaining matches in one request
+            if details_by_id is None:
+                details_by_id = self.get_foods_details([match['fdcId'] for match in foods[position:] if match.get('fdcId')])
+            
+            details = details_by_id.get(fdc_id)
             
             if not details:
                 continue
             
-            # Extract portion data for density calculation
-            portions = details.get('foodPortions', [])
+            density_info = self._density_from_portions(self._volume_portions(fdc_id, details), description, fdc_id)
+            if density_info:
+                return density_info
+        
+        return None
+    
+    def _parse_volume_portions(self, portions: List[Dict[str, Any]],
+                               description_key: str) -> List[Tuple[float, str, float]]:
+        """(amount, unit_name, gram_weight) for each portion or measure given in volume units."""
+        volume_portions = []
+        for portion in portions:
+            portion_description = (portion.get(description_key) or '').lower()
+            gram_weight = portion.get('gramWeight')
+            
+            if not gram_weight or not portion_description:
+                continue
             
-            for portion in portions:
-                portion_description = portion.get('portionDescription', '').lower()
-                gram_weight = portion.get('gramWeight')
-                
-                if not gram_weight or not portion_description:
-                    continue
-                
-                # Parse portion description for volume measurements
-                # Examples: "1 cup", "2 tablespoons", "1 fluid ounce"
-                volume_info = self._parse_portion_description(portion_description)
-                
-                if volume_info:
-                    amount, unit_name = volume_info
-                    # Calculate density from volume portion
-                    density_info = self._calculate_density_from_portion(
-                        amount, unit_name, gram_weight, description, fdc_id
-                    )
-                    
-                    if density_info:
-                        return density_info
+            # Parse portion description for volume measurements
+            # Examples: "1 cup", "2 tablespoons", "1 fluid ounce"
+            volume_info = self._parse_portion_description(portion_description)
+            
+            if volume_info:
+                volume_portions.append((*volume_info, gram_weight))
+        
+        return volume_portions
+    
+    def _density_from_portions(self, volume_portions: List[Tuple[float, str, float]],
+                               description: str, fdc_id: int) -> Optional[Dict[str, Any]]:
+        """Density from the first volume portion that gives a plausible value."""
+        for amount, unit_name, gram_weight in volume_portions:
+            # Calculate density from volume portion
+            density_info = self._calculate_density_from_portion(
+                amount, unit_name, gram_weight, description, fdc_id
+            )
+            
+            if density_info:
+                return density_info
         
         return None
     
+    def _volume_portions(self, fdc_id: int, details: Dict[str, Any]) -> List[Tuple[float, str, float]]:
+        """(amount, unit_name, gram_weight) for each volume portion of a food, parsed once per food."""
+        cache_key = ('portions', fdc_id)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        volume_portions = self._parse_volume_portions(details.get('foodPortions', []), 'portionDescription')
+        self._set_cached(cache_key, volume_portions)
+        return volume_portions
+    
     def _calculate_density_from_portion(self, amount: float, unit_name: str, 
                                        gram_weight: float, description: str, 
                                        fdc_id: int) -> Optional[Dict[str, Any]]:
@@ -205,7 +349,7 @@ class USDAFoodAPI:
         
         # Sanity check - density should be reasonable for food
         if density_g_ml < 0.1 or density_g_ml > 3.0:
-            self.logger.warning(f"Unusual density {density_g_ml} g/ml for {description}")
+            self.logger.warning("Unusual density %s g/ml for %s", density_g_ml, description)
             return None
         
         return {
@@ -241,78 +385,17 @@ class USDAFoodAPI:
         """
         description = description.lower().strip()
         
-        # Define volume units we're looking for
-        volume_patterns = [
-            (r'(\d+(?:\.\d+)?)\s*cups?', 'cup'),
-            (r'(\d+(?:\.\d+)?)\s*tablespoons?', 'tablespoon'),
-            (r'(\d+(?:\.\d+)?)\s*tbsps?', 'tablespoon'),
-            (r'(\d+(?:\.\d+)?)\s*teaspoons?', 'teaspoon'),
-            (r'(\d+(?:\.\d+)?)\s*tsps?', 'teaspoon'),
-            (r'(\d+(?:\.\d+)?)\s*fluid\s*ounces?', 'fluid ounce'),
-            (r'(\d+(?:\.\d+)?)\s*fl\s*ozs?', 'fluid ounce'),
-            (r'(\d+(?:\.\d+)?)\s*milliliters?', 'ml'),
-            (r'(\d+(?:\.\d+)?)\s*mls?', 'ml'),
-            (r'(\d+(?:\.\d+)?)\s*liters?', 'liter'),
-            (r'(\d+(?:\.\d+)?)\s*pints?', 'pint'),
-            (r'(\d+(?:\.\d+)?)\s*quarts?', 'quart'),
-            (r'(\d+(?:\.\d+)?)\s*gallons?', 'gallon'),
-        ]
-        
-        import re
-        
-        for pattern, unit in volume_patterns:
-            match = re.search(pattern, description)
-            if match:
-                try:
-                    amount = float(match.group(1))
-                    return (amount, unit)
-                except ValueError:
-                    continue
+        match = _VOLUME_RE.search(description)
+        if match:
+            return (float(match.group(1)), match.lastgroup.replace('_', ' '))
         
         return None
     
-    def _convert_to_ml(self, amount: float, unit_name: str) -> Optional[float]:
-        """Convert various volume units to milliliters."""
-        unit_name = unit_name.lower().strip()
-        
-        # Standard conversions to ml
-        conversions = {
-            'cup': 236.588,
-            'cups': 236.588,
-            'tablespoon': 14.787,
-            'tablespoons': 14.787,
-            'tbsp': 14.787,
-            'teaspoon': 4.929,
-            'teaspoons': 4.929,
-            'tsp': 4.929,
-            'fluid ounce': 29.574,
-            'fluid ounces': 29.574,
-            'fl oz': 29.574,
-            'fl. oz.': 29.574,
-            'ml': 1,
-            'milliliter': 1,
-            'milliliters': 1,
-            'liter': 1000,
-            'liters': 1000,
-            'l': 1000,
-            'pint': 473.176,
-            'pints': 473.176,
-            'quart': 946.353,
-            'quarts': 946.353,
-            'gallon': 3785.41,
-            'gallons': 3785.41
-        }
-        
-        # Look for exact match first
-        if unit_name in conversions:
-            return amount * conversions[unit_name]
-        
-        # Look for partial matches
-        for unit, factor in conversions.items():
-            if unit in unit_name or unit_name in unit:
-                return amount * factor
-        
-        return None
+    @staticmethod
+    def _convert_to_ml(amount: float, unit_name: str) -> Optional[float]:
+        """Convert a unit name from _parse_portion_description to milliliters."""
+        factor = _ML_PER_UNIT.get(unit_name)
+        return amount * factor if factor else None
     
     def get_ingredient_suggestions(self, partial_name: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -339,7 +422,24 @@ class USDAFoodAPI:
         
         return suggestions
     
+    def _get_cached(self, cache_key: tuple) -> Any:
+        """Return a cached API response, marking it recently used, or None."""
+        with self._cache_lock:
+            if cache_key not in self.cache:
+                return None
+            self.cache.move_to_end(cache_key)
+            return self.cache[cache_key]
+    
+    def _set_cached(self, cache_key: tuple, value: Any):
+        """Cache an API response, evicting the least recently used beyond the bound."""
+        with self._cache_lock:
+            self.cache[cache_key] = value
+            self.cache.move_to_end(cache_key)
+            if len(self.cache) > _CACHE_MAX_ENTRIES:
+                self.cache.popitem(last=False)
+    
     def clear_cache(self):
         """Clear the API response cache."""
-        self.cache.clear()
+        with self._cache_lock:
+            self.cache.clear()
         self.logger.info("USDA API cache cleared")
\ No newline at end of file
@@ -1,9 +1,14 @@
 """
 Graph Visualization Utility for LangGraph Workflows
 """
+from functools import lru_cache
+import hashlib
 from pathlib import Path
 from typing import Optional
+import shutil
+import subprocess
 import sys
+import time
 
 # Add project root to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -12,6 +17,20 @@ from config.settings import Settings
 from src.orchestrators.orchestrator_langgraph import LangGraphRecipeOrchestrator
 
 
+@lru_cache(maxsize=1)
+def _get_workflow_graph():
+    """Build the orchestrator once and return its compiled workflow graph."""
+    settings = Settings.load()
+    orchestrator = LangGraphRecipeOrchestrator(settings)
+    return orchestrator.workflow.get_graph()
+
+
+@lru_cache(maxsize=1)
+def _get_mermaid_code() -> str:
+    """Draw the workflow graph as Mermaid code once; the graph never changes within a run."""
+    return _get_workflow_graph().draw_mermaid()
+
+
 def generate_mermaid_diagram(save_path: Optional[Path] = None) -> str:
     """
     Generate Mermaid diagram code for the LangGraph recipe processing workflow.
@@ -22,32 +41,28 @@ def generate_mermaid_diagram(save_path: Optional[Path] = None) -> str:
     Returns:
         str: Mermaid diagram code
     """
-    # Initialize settings and orchestrator
-    settings = Settings.load()
-    orchestrator = LangGraphRecipeOrchestrator(settings)
-    
-    # Get the compiled workflow graph
-    workflow_graph = orchestrator.workflow.get_graph()
-    
-    # Generate Mermaid diagram code
-    mermaid_code = workflow_graph.draw_mermaid()
+    # Generate Mermaid diagram code from the compiled workflow graph
+    mermaid_code = _get_mermaid_code()
     
     # Save to file if path provided
     if save_path:
-        save_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(save_path, 'w', encoding='utf-8') as f:
-            f.write(mermaid_code)
+        if not save_path.parent.is_dir():
+            save_path.parent.mkdir(parents=True, exist_ok=True)
+        save_path.write_text(mermaid_code, encoding='utf-8')
         print(f"Mermaid diagram saved to: {save_path}")
     
     return mermaid_code
 
 
-def generate_workflow_diagram(output_dir: Optional[Path] = None) -> dict:
+def generate_workflow_diagram(output_dir: Optional[Path] = None, timeout: int = 60,
+                              puppeteer_config: Optional[Path] = None) -> dict:
     """
     Generate complete workflow diagram in multiple formats.
     
     Args:
         output_dir: Directory to save outputs (defaults to ./output)
+        timeout: Seconds to allow mermaid-cli for rendering both images
+        puppeteer_config: Optional Puppeteer config passed to mermaid-cli (e.g. for sandboxless CI)
         
     Returns:
         dict: Paths to generated files
@@ -66,50 +81,77 @@ def generate_workflow_diagram(output_dir: Optional[Path] = None) -> dict:
         "mermaid_code": mermaid_code
     }
     
-    # Try to generate PNG using mermaid-cli if available
+    # Render PNG and SVG with mermaid-cli side by side: each mmdc run spends most of its
+    # time booting its own headless browser
+    image_files = {
+        "png_file": output_dir / "workflow_diagram.png",
+        "svg_file": output_dir / "workflow_diagram.svg"
+    }
+    
+    # Skip mermaid-cli when the images were already rendered from identical Mermaid source
+    hash_path = output_dir / ".workflow_diagram.sha256"
+    mermaid_hash = hashlib.sha256(mermaid_code.encode()).hexdigest()
     try:
-        import subprocess
-        png_path = output_dir / "workflow_diagram.png"
-        result = subprocess.run([
-            "mmdc", "-i", str(mermaid_path), "-o", str(png_path)
-        ], capture_output=True, text=True, timeout=30)
-        
-        if result.returncode == 0:
-            results["png_file"] = png_path
-            print(f"PNG diagram saved to: {png_path}")
-        else:
-            print("mermaid-cli not available or failed. Install with: npm install -g @mermaid-js/mermaid-cli")
-            
-    except (FileNotFoundError, subprocess.TimeoutExpired):
+        previous_hash = hash_path.read_text().strip()
+    except OSError:
+        previous_hash = None
+    if previous_hash == mermaid_hash and all(path.exists() for path in image_files.values()):
+        for key, path in image_files.items():
+            results[key] = path
+            print(f"{path.suffix[1:].upper()} diagram up to date: {path}")
+        return results
+    
+    # Look the binary up once instead of letting each launch fail
+    mmdc = shutil.which("mmdc")
+    if mmdc is None:
         print("mermaid-cli not found. Install with: npm install -g @mermaid-js/mermaid-cli")
+        return results
+    
+    extra_args = ["-p", str(puppeteer_config)] if puppeteer_config else []
+    started = time.perf_counter()
+    processes = {
+        key: subprocess.Popen(
+            [mmdc, "-i", str(mermaid_path), "-o", str(path), *extra_args],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        for key, path in image_files.items()
+    }
     
-    # Try to generate SVG
-    try:
-        svg_path = output_dir / "workflow_diagram.svg"
-        result = subprocess.run([
-            "mmdc", "-i", str(mermaid_path), "-o", str(svg_path)
-        ], capture_output=True, text=True, timeout=30)
+    # Both runs share one timeout budget
+    deadline = started + timeout
+    for key, process in processes.items():
+        try:
+            returncode = process.wait(timeout=max(0, deadline - time.perf_counter()))
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            returncode = None
         
-        if result.returncode == 0:
-            results["svg_file"] = svg_path
-            print(f"SVG diagram saved to: {svg_path}")
-            
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        pass
+        path = image_files[key]
+        if returncode == 0:
+            results[key] = path
+            print(f"{path.suffix[1:].upper()} diagram saved to: {path}")
+        elif key == "png_file":
+            print("mermaid-cli not available or failed. Install with: npm install -g @mermaid-js/mermaid-cli")
+    
+    print(f"mermaid-cli finished in {time.perf_counter() - started:.1f}s")
+    
+    # Only remember the source once both images rendered, so failed runs are retried
+    if all(key in results for key in image_files):
+        hash_path.write_text(mermaid_hash)
+    else:
+        hash_path.unlink(missing_ok=True)
     
     return results
 
 
 def print_workflow_info():
     """Print information about the workflow structure."""
-    settings = Settings.load()
-    orchestrator = LangGraphRecipeOrchestrator(settings)
-    
     print("Recipe Processing Workflow Structure")
     print("=" * 40)
     
     # Get graph structure
-    graph = orchestrator.workflow.get_graph()
+    graph = _get_workflow_graph()
     
     print(f"Nodes: {len(graph.nodes)}")
     for node_id in graph.nodes:
@@ -148,4 +190,5 @@ if __name__ == "__main__":
     
     print(f"\nMermaid Code Preview:")
     print("-" * 50)
-    print(results["mermaid_code"][:500] + "..." if len(results["mermaid_code"]) > 500 else results["mermaid_code"])
\ No newline at end of file
+    mermaid_code = results["mermaid_code"]
+    print(mermaid_code[:500] + ("..." if len(mermaid_code) > 500 else ""))
\ No newline at end of file
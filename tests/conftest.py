@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures
+"""
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+from config.settings import Settings
+from src.models.recipe import Recipe, Ingredient, InstructionStep
+from src.agents.scraper import ScraperAgent
+from src.agents.parser import ParserAgent
+from src.agents.normalizer import NormalizerAgent
+from src.agents.converter import ConverterAgent
+from src.agents.renderer import RendererAgent
+
+def pytest_configure(config):
+    """Register the markers used by the test suite."""
+    config.addinivalue_line("markers", "slow: processes real recipes end to end")
+    config.addinivalue_line("markers", "llm: may call a configured LLM provider")
+    config.addinivalue_line("markers", "vcr: replay HTTP traffic from a recorded cassette (pytest-recording)")
+
+@pytest.fixture(scope="session")
+def settings():
+    """Load settings once for the whole test session."""
+    return Settings()
+
+@pytest.fixture(scope="session")
+def agents(settings):
+    """Construct each agent once for the whole test session."""
+    return SimpleNamespace(
+        scraper=ScraperAgent(settings),
+        parser=ParserAgent(settings),
+        normalizer=NormalizerAgent(settings),
+        converter=ConverterAgent(settings),
+        renderer=RendererAgent(settings)
+    )
+
+@pytest.fixture(scope="session")
+def sample_recipe():
+    """Chocolate chip cookie recipe shared by the system tests."""
+    return Recipe(
+        title="Test Chocolate Chip Cookies",
+        description="Simple and delicious chocolate chip cookies",
+        prep_time=15,
+        cook_time=12,
+        servings=24,
+        ingredients=[
+            Ingredient(name="all-purpose flour", quantity=2.25, unit="cup", original_text="2 1/4 cups all-purpose flour"),
+            Ingredient(name="butter", quantity=1.0, unit="cup", original_text="1 cup butter, softened"),
+            Ingredient(name="brown sugar", quantity=0.75, unit="cup", original_text="3/4 cup brown sugar"),
+            Ingredient(name="white sugar", quantity=0.75, unit="cup", original_text="3/4 cup white sugar"),
+            Ingredient(name="eggs", quantity=2.0, unit="large", original_text="2 large eggs"),
+            Ingredient(name="vanilla extract", quantity=2.0, unit="tsp", original_text="2 tsp vanilla extract"),
+            Ingredient(name="chocolate chips", quantity=2.0, unit="cup", original_text="2 cups chocolate chips")
+        ],
+        instructions=[
+            InstructionStep(step_number=1, instruction="Preheat oven to 375°F (190°C)"),
+            InstructionStep(step_number=2, instruction="In a large bowl, cream together butter and sugars until light and fluffy"),
+            InstructionStep(step_number=3, instruction="Beat in eggs one at a time, then add vanilla"),
+            InstructionStep(step_number=4, instruction="Gradually mix in flour until just combined"),
+            InstructionStep(step_number=5, instruction="Fold in chocolate chips"),
+            InstructionStep(step_number=6, instruction="Drop rounded tablespoons of dough onto ungreased baking sheets"),
+            InstructionStep(step_number=7, instruction="Bake for 9-12 minutes or until golden brown"),
+            InstructionStep(step_number=8, instruction="Cool on baking sheet for 2 minutes before transferring to wire rack")
+        ],
+        tags=["dessert", "cookies", "chocolate", "baking"],
+    )
+
+@pytest.fixture(scope="module")
+def vcr_config():
+    """Record each cassette on first run, then replay it without network access; API keys are kept out of cassettes."""
+    return {
+        "record_mode": "once",
+        "filter_headers": ["authorization", "x-api-key"],
+        "filter_query_parameters": ["api_key"],
+    }
+
+@pytest.fixture(scope="module")
+def vcr_cassette_dir():
+    """Keep recorded cassettes next to the tests."""
+    return str(Path(__file__).parent / "cassettes")
@@ -2,143 +2,130 @@
 """
 Integration tests for the complete pipeline
 """
+import asyncio
+import contextlib
 import pytest
 from pathlib import Path
-from config.settings import Settings
-from orchestrators.orchestrator import RecipeOrchestrator
+from src.orchestrators.orchestrator_langgraph import LangGraphRecipeOrchestrator
+
+@pytest.fixture(scope="module")
+def orchestrator(settings):
+    """LangGraphRecipeOrchestrator shared by all tests in this module."""
+    return LangGraphRecipeOrchestrator(settings)
+
+@pytest.fixture(scope="module")
+def pipeline_result(orchestrator, vcr_cassette_dir, vcr_config):
+    """Run the pipeline once with debug output and share the result across tests."""
+    # Module-scoped, so pytest-recording's per-test cassette would not wrap it
+    try:
+        import vcr
+        cassette = vcr.VCR(cassette_library_dir=vcr_cassette_dir, **vcr_config).use_cassette("baba_ganoush.yaml")
+    except ImportError:
+        cassette = contextlib.nullcontext()
+    
+    with cassette:
+        return orchestrator.process_recipe(
+            "https://www.seriouseats.com/the-best-baba-ganoush-recipe",
+            output_format="html",
+            debug_enabled=True,
+            debug_dir="./test_debug"
+        )
 
 class TestRecipeOrchestrator:
     """Test complete recipe processing pipeline."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.settings = Settings()
-        self.orchestrator = RecipeOrchestrator(self.settings)
-    
-    def test_initialization(self):
+    def test_initialization(self, orchestrator, settings):
         """Test orchestrator initialization."""
-        assert self.orchestrator.settings == self.settings
-        assert hasattr(self.orchestrator, 'scraper')
-        assert hasattr(self.orchestrator, 'parser')
-        assert hasattr(self.orchestrator, 'normalizer')
-        assert hasattr(self.orchestrator, 'converter')
-        assert hasattr(self.orchestrator, 'renderer')
+        assert orchestrator.settings == settings
+        assert hasattr(orchestrator, 'scraper')
+        assert hasattr(orchestrator, 'parser')
+        assert hasattr(orchestrator, 'normalizer')
+        assert hasattr(orchestrator, 'converter')
+        assert hasattr(orchestrator, 'renderer')
     
     @pytest.mark.slow
-    def test_complete_pipeline_with_known_site(self):
+    @pytest.mark.llm
+    def test_complete_pipeline_with_known_site(self, pipeline_result):
         """Test complete pipeline with a known working recipe site."""
-        test_urls = [
-            "https://www.seriouseats.com/the-best-baba-ganoush-recipe",
-        ]
+        assert pipeline_result.success is True, f"Pipeline failed: {pipeline_result.error}"
+        assert pipeline_result.recipe is not None
+        assert pipeline_result.output_path is not None
+        assert pipeline_result.output_path.exists()
         
-        for url in test_urls:
-            try:
-                result = self.orchestrator.process_recipe(
-                    url, 
-                    output_format="html",
-                    debug_enabled=True
-                )
-                
-                assert result.success is True, f"Failed to process {url}: {result.error}"
-                assert result.recipe is not None
-                assert result.output_path is not None
-                assert result.output_path.exists()
-                
-                # Verify recipe has essential components
-                recipe = result.recipe
-                assert recipe.title is not None
-                assert len(recipe.title.strip()) > 0
-                assert len(recipe.ingredients) > 0
-                assert len(recipe.instructions) > 0
-                
-                print(f"✓ Successfully processed: {recipe.title}")
-                
-            except Exception as e:
-                pytest.fail(f"Pipeline failed for {url}: {e}")
+        # Verify recipe has essential components
+        recipe = pipeline_result.recipe
+        assert recipe.title is not None
+        assert len(recipe.title.strip()) > 0
+        assert len(recipe.ingredients) > 0
+        assert len(recipe.instructions) > 0
+        
+        print(f"✓ Successfully processed: {recipe.title}")
     
-    def test_invalid_url_handling(self):
+    def test_invalid_url_handling(self, orchestrator):
         """Test handling of invalid URLs."""
-        result = self.orchestrator.process_recipe("https://definitely-not-a-real-website.com/recipe")
+        result = orchestrator.process_recipe("https://definitely-not-a-real-website.com/recipe")
         assert result.success is False
         assert result.error is not None
     
-    def test_debug_output(self):
+    @pytest.mark.slow
+    @pytest.mark.llm
+    def test_debug_output(self, pipeline_result):
         """Test debug output generation."""
-        # Use a simple URL that should work
-        url = "https://www.seriouseats.com/the-best-baba-ganoush-recipe"
-        
-        result = self.orchestrator.process_recipe(
-            url,
-            output_format="html",
-            debug_enabled=True,
-            debug_dir="./test_debug"
-        )
-        
-        if result.success:
-            assert result.debug_dir is not None
-            debug_path = Path(result.debug_dir)
+        if pipeline_result.success:
+            assert pipeline_result.debug_dir is not None
+            debug_path = Path(pipeline_result.debug_dir)
             assert debug_path.exists()
             
-            # Check for debug files
+            # Check for debug files, statting them concurrently
             expected_files = [
                 "01_scraper.json",
                 "02_parser.json", 
                 "03_normalizer.json",
                 "04_converter.json",
-                "05_renderer.json",
+                "05_renderer_json.json",
+                "06_renderer_html.json",
                 "summary.json"
             ]
             
-            for filename in expected_files:
-                file_path = debug_path / filename
-                assert file_path.exists(), f"Debug file {filename} not found"
+            async def check_files():
+                return await asyncio.gather(*(
+                    asyncio.to_thread((debug_path / filename).exists) for filename in expected_files
+                ))
+            
+            for filename, exists in zip(expected_files, asyncio.run(check_files())):
+                assert exists, f"Debug file {filename} not found"
     
-    def test_multiple_output_formats(self):
-        """Test generation of multiple output formats."""
-        url = "https://www.seriouseats.com/the-best-baba-ganoush-recipe"
+    @pytest.mark.slow
+    @pytest.mark.llm
+    @pytest.mark.parametrize("output_format,suffix", [("html", ".html"), ("latex", ".tex"), ("json", ".json")])
+    def test_multiple_output_formats(self, orchestrator, pipeline_result, output_format, suffix):
+        """Test generation of multiple output formats from a single pipeline run."""
+        if not pipeline_result.success:
+            pytest.skip(f"Pipeline failed: {pipeline_result.error}")
+        
+        result = orchestrator.renderer.render(pipeline_result.recipe, output_format)
         
-        formats_to_test = ["html", "latex", "json"]
+        assert result.success is True, f"Failed to generate {output_format}: {result.error}"
+        assert result.data.output_path is not None
+        assert result.data.output_path.exists()
+        assert result.data.output_path.suffix == suffix
         
-        for output_format in formats_to_test:
-            try:
-                result = self.orchestrator.process_recipe(url, output_format=output_format)
-                
-                if result.success:
-                    assert result.output_path is not None
-                    assert result.output_path.exists()
-                    
-                    # Check file extension matches format
-                    if output_format == "html":
-                        assert result.output_path.suffix == ".html"
-                    elif output_format == "latex":
-                        assert result.output_path.suffix == ".tex"
-                    elif output_format == "json":
-                        assert result.output_path.suffix == ".json"
-                    
-                    print(f"✓ Generated {output_format} output: {result.output_path}")
-                else:
-                    print(f"⚠ Failed to generate {output_format}: {result.error}")
-                    
-            except Exception as e:
-                print(f"✗ Error testing {output_format}: {e}")
+        print(f"✓ Generated {output_format} output: {result.data.output_path}")
 
 class TestPerformance:
     """Test performance characteristics."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.settings = Settings()
-        self.orchestrator = RecipeOrchestrator(self.settings)
-    
+    @pytest.mark.vcr
     @pytest.mark.slow
-    def test_processing_time_reasonable(self):
+    @pytest.mark.llm
+    def test_processing_time_reasonable(self, orchestrator):
         """Test that processing time is reasonable."""
         import time
         
         url = "https://www.seriouseats.com/the-best-baba-ganoush-recipe"
         
         start_time = time.time()
-        result = self.orchestrator.process_recipe(url, debug_enabled=True)
+        result = orchestrator.process_recipe(url, debug_enabled=True)
         end_time = time.time()
         
         processing_time = end_time - start_time
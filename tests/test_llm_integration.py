@@ -4,29 +4,25 @@ Unit tests for LLM integration
 """
 import pytest
 import os
+import importlib.util
 from unittest.mock import Mock, patch
-from config.settings import Settings
-from agents.llm_integration import LLMManager, LLMProvider, LLMUsage
+from src.agents.llm_integration import LLMManager, LLMProvider, LLMUsage
 
 class TestLLMIntegration:
     """Test LLM integration functionality."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.settings = Settings()
-        
-    def test_settings_structure(self):
+    def test_settings_structure(self, settings):
         """Test that settings have correct LLM structure."""
-        assert hasattr(self.settings, 'llm')
-        assert hasattr(self.settings.llm, 'anthropic_model')
-        assert hasattr(self.settings.llm, 'openai_model')
-        assert hasattr(self.settings.llm, 'ollama_model')
-        assert hasattr(self.settings.llm, 'default_provider')
+        assert hasattr(settings, 'llm')
+        assert hasattr(settings.llm, 'anthropic_model')
+        assert hasattr(settings.llm, 'openai_model')
+        assert hasattr(settings.llm, 'ollama_model')
+        assert hasattr(settings.llm, 'default_provider')
     
-    def test_llm_manager_initialization(self):
+    def test_llm_manager_initialization(self, settings):
         """Test LLM manager initialization."""
-        manager = LLMManager(self.settings)
-        assert manager.settings == self.settings
+        manager = LLMManager(settings)
+        assert manager.settings == settings
         assert isinstance(manager.clients, dict)
     
     def test_usage_tracking(self):
@@ -38,19 +34,22 @@ class TestLLMIntegration:
         assert usage.cost_usd == 0.0
         assert usage.response_time_ms == 0
     
-    def test_get_available_providers(self):
+    def test_get_available_providers(self, settings):
         """Test getting available providers."""
-        manager = LLMManager(self.settings)
+        manager = LLMManager(settings)
         providers = manager.get_available_providers()
         assert isinstance(providers, list)
         # Should have at least Ollama available in most environments
     
-    def test_cost_calculation_anthropic(self):
+    @pytest.mark.llm
+    def test_cost_calculation_anthropic(self, settings):
         """Test cost calculation for Anthropic."""
         # This will only work if Anthropic is available
+        if importlib.util.find_spec("anthropic") is None:
+            pytest.skip("anthropic not installed")
         try:
-            from agents.llm_integration import AnthropicClient
-            client = AnthropicClient(self.settings)
+            from src.agents.llm_integration import AnthropicClient
+            client = AnthropicClient(settings)
             
             # Test cost calculation (without actual API call)
             cost = client._calculate_cost(1000, 500)  # 1k input, 500 output tokens
@@ -60,11 +59,14 @@ class TestLLMIntegration:
         except (ImportError, Exception):
             pytest.skip("Anthropic not available")
     
-    def test_cost_calculation_openai(self):
+    @pytest.mark.llm
+    def test_cost_calculation_openai(self, settings):
         """Test cost calculation for OpenAI."""
+        if importlib.util.find_spec("openai") is None:
+            pytest.skip("openai not installed")
         try:
-            from agents.llm_integration import OpenAIClient
-            client = OpenAIClient(self.settings)
+            from src.agents.llm_integration import OpenAIClient
+            client = OpenAIClient(settings)
             
             # Test cost calculation (without actual API call)
             cost = client._calculate_cost(1000, 500)  # 1k input, 500 output tokens
@@ -75,9 +77,9 @@ class TestLLMIntegration:
             pytest.skip("OpenAI not available")
     
     @patch('time.sleep')  # Mock sleep for faster tests
-    def test_retry_mechanism(self, mock_sleep):
+    def test_retry_mechanism(self, mock_sleep, settings):
         """Test retry mechanism with backoff."""
-        from agents.llm_integration import BaseLLMClient
+        from src.agents.llm_integration import BaseLLMClient
         
         class TestClient(BaseLLMClient):
             def generate(self, prompt: str, **kwargs) -> str:
@@ -86,7 +88,7 @@ class TestLLMIntegration:
             def is_available(self) -> bool:
                 return True
         
-        client = TestClient(self.settings)
+        client = TestClient(settings)
         
         # Test successful retry
         call_count = 0